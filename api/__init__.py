@@ -1,5 +1,12 @@
 """API package for RP query system."""
 
-from .rp_query_api import RPQueryService, create_app
-
 __all__ = ["RPQueryService", "create_app"]
+
+
+def __getattr__(name):
+    # Resolve lazily so `import api` does not pull in the whole service stack.
+    if name in __all__:
+        from . import rp_query_api
+
+        return getattr(rp_query_api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
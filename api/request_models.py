@@ -0,0 +1,50 @@
+"""Request bodies for the FastAPI endpoints (pydantic ships with FastAPI)."""
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, field_validator
+
+
+class RPRequest(BaseModel):
+    """Body of /api/v1/rp/query-context."""
+
+    message: str
+    session_id: str
+    novel_id: Optional[str] = None
+    unlocked_chapter: Optional[int] = None
+    active_characters: Optional[List[str]] = None
+    recent_messages: Optional[List[Dict[str, Any]]] = None
+
+    @field_validator("message", "session_id", "novel_id", mode="before")
+    @classmethod
+    def _coerce_number_to_str(cls, value: Any) -> Any:
+        # The hand-parsed bodies these models replaced took numeric ids and
+        # messages (`"session_id": 42`) and used them as strings; keep accepting them.
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        return value
+
+
+class RespondRequest(RPRequest):
+    """Body of /api/v1/rp/respond; context and citations are optional (retrieved when missing)."""
+
+    worldbook_context: Optional[Dict[str, Any]] = None
+    citations: Optional[List[Dict[str, Any]]] = None
+
+
+class PipelineRunRequest(BaseModel):
+    """Body of /api/v1/novels/{novel_id}/pipeline/run."""
+
+    step: Optional[int] = None
+    force: bool = False
+    redo_chapter: Optional[int] = None
+
+
+def validation_error_detail(errors: List[Dict[str, Any]]) -> str:
+    """Summarize pydantic errors as the single `detail` string other 4xx responses use."""
+    if not errors:
+        return "invalid request"
+    error = errors[0]
+    field = ".".join(str(part) for part in error.get("loc", ()) if part != "body") or "body"
+    if error.get("type") == "missing":
+        return f"missing field: {field}"
+    return f"invalid field: {field} ({error.get('msg', 'invalid value')})"
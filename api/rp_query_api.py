@@ -1,25 +1,133 @@
 """RP query service and optional FastAPI endpoints."""
+import asyncio
+import codecs
+import contextlib
+import copy
+import functools
+import hashlib
+import io
 import json
 import os
+import secrets
+import sys
 import threading
-import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import yaml
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
 from services.guardrails import Guardrails
 from services.auth_service import Actor, AuthService
 from services.db import Database
-from services.novels_service import NovelsService
+from services.novels_service import NovelRecord, NovelsService
 from services.pipeline_jobs import PipelineJobsService
 from services.pipeline_runner import PipelineRunner, PipelineRunSpec
-from services.query_understanding import QueryUnderstandingService
-from services.retrieval_orchestrator import RetrievalOrchestrator
-from services.session_state import SessionStateStore
+from services.response_cache import ResponseCache
+from services.session_state import (
+    SESSION_LOCKS,
+    SessionLockRegistry,
+    SessionState,
+    SessionStateCache,
+    SessionStateStore,
+    SessionWriteBuffer,
+    build_session_store,
+)
 from services.storage_layout import StorageLayout
-from services.worldbook_builder import WorldbookBuilder
-from utils.llm_client import LLMClient
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    # The retrieval/LLM stack pulls in qdrant_client and openai; import it lazily.
+    from services.query_understanding import QueryUnderstandingService
+    from services.retrieval_orchestrator import RetrievalOrchestrator
+    from services.worldbook_builder import WorldbookBuilder
+    from utils.llm_client import LLMClient
+
+
+def _has_only_str_keys(value: Any) -> bool:
+    # json.dump would turn other keys (YAML ints, bools, None) into strings, so the
+    # sidecar would not round-trip to the same config.
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _has_only_str_keys(item) for key, item in value.items())
+    if isinstance(value, list):
+        return all(_has_only_str_keys(item) for item in value)
+    return True
+
+
+def _file_version(st: os.stat_result) -> Tuple[int, int, int]:
+    # mtime alone misses same-second rewrites and files swapped in with an older
+    # mtime (mv, rsync -t, checkouts); inode and size catch those.
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_config_file(abs_path: str, version: Tuple[int, int, int]) -> Dict[str, Any]:
+    # A JSON sibling is much cheaper to parse than YAML; trust it only when it was
+    # written from exactly this version of the YAML source and is no more readable
+    # than it (it holds the same API keys).
+    cache_path = f"{abs_path}.cache.json"
+    source_mode = os.stat(abs_path).st_mode & 0o777
+    try:
+        if not (os.stat(cache_path).st_mode & 0o777 & ~source_mode):
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if isinstance(cached, dict) and cached.get("source") == list(version):
+                return cached["config"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    from utils.config_loader import load_yaml_config
+
+    config = load_yaml_config(abs_path)
+    if not _has_only_str_keys(config):
+        return config
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, source_mode)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"source": list(version), "config": config}, f, ensure_ascii=False)
+        # O_CREAT leaves the mode of an existing leftover temp file untouched.
+        os.chmod(tmp_path, source_mode)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # Read-only mounts or non-JSON YAML values: just skip the sidecar.
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return config
+
+
+def _load_config_file(config_file: str) -> Dict[str, Any]:
+    abs_path = os.path.abspath(config_file)
+    config = _parse_config_file(abs_path, _file_version(os.stat(abs_path)))
+    # Callers mutate their config; never hand out the memoized object itself.
+    return copy.deepcopy(config)
+
+_NO_EVIDENCE_REPLY = "未检索到明确证据，请补充人物、地点或章节范围后重试。"
+_FALLBACK_HEADER = "根据当前证据："
+_FALLBACK_FOOTER = "如果你希望我继续推进剧情，请指定你要扮演的角色和当前目标。"
+
+
+_GUEST_SYSTEM_PROMPT = "你是 AIRP 的聊天助手。无需引用证据，回答要清晰、有帮助。"
+
+
+def _format_guest_prompt(history: List[Dict[str, Any]], message: str) -> str:
+    lines = []
+    for turn in history:
+        role = str(turn.get("role") or "")
+        content = str(turn.get("content") or "")
+        if role and content:
+            lines.append(f"- {role}: {content}\n")
+    return f"对话上下文：\n{''.join(lines)}\n用户：{message}\n助手："
+
+
+def _format_fallback_fact(item: Dict[str, Any]) -> str:
+    # Facts may come back from the client payload, so keep the tolerant .get lookups.
+    source_chapter = item.get("source_chapter") or "unknown"
+    source_scene = item.get("source_scene")
+    if source_scene is not None:
+        return f"- {item.get('fact_text', '')}（{source_chapter} / scene {source_scene}）"
+    return f"- {item.get('fact_text', '')}（{source_chapter}）"
 
 
 def _default_sessions_dir(config: Dict[str, Any]) -> str:
@@ -42,35 +150,183 @@ def _derive_data_root(config: Dict[str, Any]) -> str:
     return "/app/data"
 
 
+def _session_etag(state: SessionState) -> str:
+    # updated_at is refreshed on every save, so it versions the persisted state.
+    return f'W/"{state.updated_at}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _scan_static_files(root: Path) -> Dict[str, Path]:
+    """Map URL paths (relative, "/"-separated) to regular files under `root`.
+
+    Symlinks are skipped so nothing outside `root` can be served.
+    """
+    files: Dict[str, Path] = {}
+    pending = [(str(root), "")]
+    while pending:
+        dir_path, prefix = pending.pop()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    continue
+                rel_path = prefix + entry.name
+                if entry.is_dir():
+                    pending.append((entry.path, rel_path + "/"))
+                elif entry.is_file():
+                    files[rel_path] = Path(entry.path)
+    return files
+
+
+def _copy_upload(
+    src: Any, dst_path: str, max_bytes: int, chunk_size: int = 8 * 1024 * 1024
+) -> Tuple[int, Optional[str], Optional[Dict[str, int]]]:
+    """Copy an uploaded file object to `dst_path`, stopping once `max_bytes` is exceeded.
+
+    Returns the number of bytes read (greater than `max_bytes` when the copy was
+    cut short), the text encoding sniffed from the same chunks, and the
+    char/line counts when the file turned out to be UTF-8 (or ASCII), which were
+    tallied while copying. Otherwise the counts are None and the caller needs a
+    stats pass in the detected encoding.
+    """
+    try:
+        from utils.text_utils import TextStats, new_encoding_detector
+
+        detector = new_encoding_detector()
+        stats = TextStats()
+        # Most uploads are UTF-8: count as if they were, and discard on a decode error.
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+    except ImportError:  # pragma: no cover - source stats are best effort
+        detector = stats = decoder = None
+    total = 0
+    try:
+        f = open(dst_path, "wb")
+    except FileNotFoundError:
+        # NovelsService.create lays out the workspace; only older novels miss it.
+        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+        f = open(dst_path, "wb")
+    with f:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > max_bytes:
+                break
+            f.write(chunk)
+            if detector is not None and not detector.done:
+                detector.feed(chunk)
+            if stats is not None:
+                try:
+                    stats.feed(decoder.decode(chunk))
+                except UnicodeDecodeError:
+                    stats = None
+    if detector is None:
+        return total, None, None
+    encoding = detector.close()["encoding"]
+    if stats is not None and total <= max_bytes:
+        try:
+            stats.feed(decoder.decode(b"", final=True))
+        except UnicodeDecodeError:
+            stats = None
+    # utf-8-sig is left to the stats pass: read_text_file strips a BOM on top of the codec.
+    try:
+        counted_as = codecs.lookup(encoding).name if encoding else None
+    except LookupError:
+        counted_as = None
+    if stats is None or counted_as not in ("utf-8", "ascii"):
+        return total, encoding, None
+    return total, encoding, stats.result()
+
+
+def _describe_text_file(path: str, encoding: Optional[str] = None) -> Dict[str, int]:
+    from utils.text_utils import text_file_stats
+
+    return text_file_stats(path, encoding=encoding)
+
+
 class RPQueryService:
     """Application-level orchestration for RP query and response APIs."""
 
     def __init__(
         self,
         config: Dict[str, Any],
-        query_understanding: Optional[QueryUnderstandingService] = None,
-        retrieval_orchestrator: Optional[RetrievalOrchestrator] = None,
-        worldbook_builder: Optional[WorldbookBuilder] = None,
+        query_understanding: Optional["QueryUnderstandingService"] = None,
+        retrieval_orchestrator: Optional["RetrievalOrchestrator"] = None,
+        worldbook_builder: Optional["WorldbookBuilder"] = None,
         session_store: Optional[SessionStateStore] = None,
         guardrails: Optional[Guardrails] = None,
-        llm_client: Optional[LLMClient] = None,
+        llm_client: Optional["LLMClient"] = None,
+        response_cache: Optional[ResponseCache] = None,
+        session_locks: Optional[SessionLockRegistry] = None,
+        context_cache: Optional[ResponseCache] = None,
     ):
         self.config = config
-        self.query_understanding = query_understanding or QueryUnderstandingService(config)
-        self.retrieval_orchestrator = retrieval_orchestrator or RetrievalOrchestrator(config)
-        rp_cfg = config.get("rp_query", {})
-        self.worldbook_builder = worldbook_builder or WorldbookBuilder(
-            max_facts=int(rp_cfg.get("worldbook_top_n", 8))
-        )
-        self.session_store = session_store or SessionStateStore(base_dir=_default_sessions_dir(config))
+        if query_understanding is None:
+            from services.query_understanding import QueryUnderstandingService
+
+            query_understanding = QueryUnderstandingService(config)
+        self.query_understanding = query_understanding
+        if retrieval_orchestrator is None:
+            from services.retrieval_orchestrator import RetrievalOrchestrator
+
+            retrieval_orchestrator = RetrievalOrchestrator(config)
+        self.retrieval_orchestrator = retrieval_orchestrator
+        if worldbook_builder is None:
+            from services.worldbook_builder import WorldbookBuilder
+
+            rp_cfg = config.get("rp_query", {})
+            worldbook_builder = WorldbookBuilder(max_facts=int(rp_cfg.get("worldbook_top_n", 8)))
+        self.worldbook_builder = worldbook_builder
+        if session_store is None:
+            rp_cfg = config.get("rp_query", {}) or {}
+            session_store = build_session_store(
+                rp_cfg,
+                base_dir=_default_sessions_dir(config),
+                key_scope="default",
+                cache=SessionStateCache(maxsize=int(rp_cfg.get("session_cache_size", 1024))),
+            )
+        self.session_store = session_store
+        self.session_locks = SESSION_LOCKS if session_locks is None else session_locks
         self.guardrails = guardrails or Guardrails()
-        self.llm_client = llm_client or LLMClient(config)
+        if llm_client is None:
+            from utils.llm_client import LLMClient
+
+            llm_client = LLMClient.shared(config)
+        self.llm_client = llm_client
+        if response_cache is None:
+            rp_cfg = config.get("rp_query", {}) or {}
+            cache_size = int(rp_cfg.get("response_cache_size", 0) or 0)
+            if cache_size > 0:
+                response_cache = ResponseCache(
+                    maxsize=cache_size,
+                    ttl_s=float(rp_cfg.get("response_cache_ttl_s", 600) or 0),
+                )
+        self.response_cache = response_cache
+        if context_cache is None:
+            rp_cfg = config.get("rp_query", {}) or {}
+            cache_size = int(rp_cfg.get("context_cache_size", 1024) or 0)
+            if cache_size > 0:
+                context_cache = ResponseCache(
+                    maxsize=cache_size,
+                    ttl_s=float(rp_cfg.get("context_cache_ttl_s", 60) or 0),
+                )
+        self.context_cache = context_cache
 
     @classmethod
     def from_config_file(cls, config_file: str = "config.yaml") -> "RPQueryService":
-        with open(config_file, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
-        return cls(config=config)
+        return cls(config=_load_config_file(config_file))
+
+    def close(self) -> None:
+        """Release per-novel retrieval resources; shared LLM/embedding clients stay open."""
+        close = getattr(self.retrieval_orchestrator, "close", None)
+        if callable(close):
+            close()
 
     def query_context(
         self,
@@ -82,14 +338,38 @@ class RPQueryService:
         session_store: Optional[SessionStateStore] = None,
     ) -> Dict[str, Any]:
         store = session_store or self.session_store
+        state = self._load_state(store, session_id, unlocked_chapter, active_characters)
+        result = self._build_context(store, state, message, recent_messages)
+        store.save(state)
+        if self.context_cache is not None:
+            key = self._context_cache_key(store, state, message, recent_messages)
+            self.context_cache.put(key, result)
+        return result
+
+    def _load_state(
+        self,
+        store: SessionStateStore,
+        session_id: str,
+        unlocked_chapter: Optional[int],
+        active_characters: Optional[List[str]],
+    ) -> SessionState:
         state = store.load(session_id, default_unlocked=unlocked_chapter or 0)
         store.apply_runtime_updates(
             state,
             unlocked_chapter=unlocked_chapter,
             active_characters=active_characters,
         )
+        return state
 
-        history = recent_messages if recent_messages is not None else state.turns[-10:]
+    def _build_context(
+        self,
+        store: SessionStateStore,
+        state: SessionState,
+        message: str,
+        recent_messages: Optional[List[Dict[str, str]]],
+    ) -> Dict[str, Any]:
+        """Run retrieval for `message` and record the user turn on `state` (unsaved)."""
+        history = recent_messages if recent_messages is not None else state.recent_turns()
 
         understanding = self.query_understanding.understand(
             message=message,
@@ -109,16 +389,26 @@ class RPQueryService:
 
         store.append_turn(state, role="user", content=message)
         store.remember_entities(state, understanding.entities)
-        store.save(state)
 
         return {
-            "session_id": session_id,
+            "session_id": state.session_id,
             "worldbook_context": worldbook_context,
             "citations": citations,
             "debug_scores": debug,
             "query_understanding": understanding.to_dict(),
         }
 
+    async def aquery_context(self, **kwargs: Any) -> Dict[str, Any]:
+        """Async variant of :meth:`query_context`.
+
+        Retrieval (embedding + Qdrant) is synchronous, so the whole pipeline runs in
+        a worker thread instead of blocking the event loop. Turns on the same
+        session are serialized so concurrent requests cannot drop each other's turns.
+        """
+        store = kwargs.pop("session_store", None) or self.session_store
+        async with self.session_locks.hold(store.lock_key(kwargs["session_id"])):
+            return await asyncio.to_thread(self.query_context, session_store=store, **kwargs)
+
     def respond(
         self,
         message: str,
@@ -130,84 +420,247 @@ class RPQueryService:
         recent_messages: Optional[List[Dict[str, str]]] = None,
         session_store: Optional[SessionStateStore] = None,
     ) -> Dict[str, Any]:
-        if worldbook_context is None or citations is None:
-            context_resp = self.query_context(
+        store, state, worldbook_context, citations = self._begin_respond(
+            message=message,
+            session_id=session_id,
+            worldbook_context=worldbook_context,
+            citations=citations,
+            unlocked_chapter=unlocked_chapter,
+            active_characters=active_characters,
+            recent_messages=recent_messages,
+            session_store=session_store,
+        )
+
+        if not self.guardrails.has_enough_evidence(citations):
+            return self._finish_respond(store, state, _NO_EVIDENCE_REPLY, worldbook_context, citations)
+
+        call_kwargs = self._grounding_call_kwargs(message, worldbook_context)
+        cache_key = self._response_cache_key(call_kwargs)
+        reply = self.response_cache.get(cache_key) if cache_key else None
+        if reply is None:
+            try:
+                reply = str(self.llm_client.call(**call_kwargs))
+            except Exception:
+                reply = self._fallback_reply(message, worldbook_context)
+            else:
+                if cache_key:
+                    self.response_cache.put(cache_key, reply)
+
+        final_reply = self.guardrails.append_citation_footer(reply, citations)
+        return self._finish_respond(store, state, final_reply, worldbook_context, citations)
+
+    async def arespond(
+        self,
+        message: str,
+        session_id: str,
+        worldbook_context: Optional[Dict[str, Any]] = None,
+        citations: Optional[List[Dict[str, Any]]] = None,
+        unlocked_chapter: Optional[int] = None,
+        active_characters: Optional[List[str]] = None,
+        recent_messages: Optional[List[Dict[str, str]]] = None,
+        session_store: Optional[SessionStateStore] = None,
+    ) -> Dict[str, Any]:
+        """Async variant of :meth:`respond` that awaits the LLM call on the event loop.
+
+        The session stays locked for the whole turn (see :meth:`aquery_context`).
+        """
+        store = session_store or self.session_store
+        async with self.session_locks.hold(store.lock_key(session_id)):
+            store, state, worldbook_context, citations = await asyncio.to_thread(
+                self._begin_respond,
                 message=message,
                 session_id=session_id,
+                worldbook_context=worldbook_context,
+                citations=citations,
                 unlocked_chapter=unlocked_chapter,
                 active_characters=active_characters,
                 recent_messages=recent_messages,
-                session_store=session_store,
+                session_store=store,
             )
+
+            if not self.guardrails.has_enough_evidence(citations):
+                return await asyncio.to_thread(
+                    self._finish_respond, store, state, _NO_EVIDENCE_REPLY, worldbook_context, citations
+                )
+
+            call_kwargs = self._grounding_call_kwargs(message, worldbook_context)
+            cache_key = self._response_cache_key(call_kwargs)
+            reply = self.response_cache.get(cache_key) if cache_key else None
+            if reply is None:
+                try:
+                    reply = str(await self._acall_llm(**call_kwargs))
+                except Exception:
+                    reply = self._fallback_reply(message, worldbook_context)
+                else:
+                    if cache_key:
+                        self.response_cache.put(cache_key, reply)
+
+            final_reply = self.guardrails.append_citation_footer(reply, citations)
+            return await asyncio.to_thread(self._finish_respond, store, state, final_reply, worldbook_context, citations)
+
+    def _begin_respond(
+        self,
+        message: str,
+        session_id: str,
+        worldbook_context: Optional[Dict[str, Any]],
+        citations: Optional[List[Dict[str, Any]]],
+        unlocked_chapter: Optional[int],
+        active_characters: Optional[List[str]],
+        recent_messages: Optional[List[Dict[str, str]]],
+        session_store: Optional[SessionStateStore],
+    ) -> Tuple[SessionStateStore, SessionState, Dict[str, Any], List[Dict[str, Any]]]:
+        store = session_store or self.session_store
+        state = self._load_state(store, session_id, unlocked_chapter, active_characters)
+
+        # Retrieve on the same in-memory state so the turn costs one load and one save.
+        if worldbook_context is None or citations is None:
+            context_resp = self._cached_context(store, state, message, recent_messages)
+            if context_resp is None:
+                context_resp = self._build_context(store, state, message, recent_messages)
             worldbook_context = context_resp["worldbook_context"]
             citations = context_resp["citations"]
-
         citations = citations or []
-        store = session_store or self.session_store
-        state = store.load(session_id, default_unlocked=unlocked_chapter or 0)
-        store.apply_runtime_updates(
-            state,
-            unlocked_chapter=unlocked_chapter,
-            active_characters=active_characters,
-        )
 
         # Avoid duplicate user turns when query_context has already recorded the same message.
         last_turn = state.turns[-1] if state.turns else {}
         if not (last_turn.get("role") == "user" and last_turn.get("content") == message):
             store.append_turn(state, role="user", content=message)
 
-        if not self.guardrails.has_enough_evidence(citations):
-            fallback_reply = "未检索到明确证据，请补充人物、地点或章节范围后重试。"
-            store.append_turn(state, role="assistant", content=fallback_reply)
-            store.save(state)
-            return {
-                "assistant_reply": fallback_reply,
-                "citations": citations,
-                "worldbook_context": worldbook_context,
-            }
-
-        system_prompt = self.guardrails.build_grounding_system_prompt()
-        user_prompt = self.guardrails.compose_grounding_prompt(message, worldbook_context)
-
-        try:
-            reply = self.llm_client.call(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
-                temperature=0.4,
-            )
-        except Exception:
-            reply = self._fallback_reply(message, worldbook_context)
+        return store, state, worldbook_context, citations
 
-        final_reply = self.guardrails.append_citation_footer(str(reply), citations)
-
-        store.append_turn(state, role="assistant", content=final_reply)
+    def _cached_context(
+        self,
+        store: SessionStateStore,
+        state: SessionState,
+        message: str,
+        recent_messages: Optional[List[Dict[str, str]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Reuse query_context's result when respond() follows it without the context.
+
+        Only valid while the session's last turn is the user message that
+        query_context just recorded for the same retrieval inputs.
+        """
+        if self.context_cache is None or not state.turns:
+            return None
+        last_turn = state.turns[-1]
+        if last_turn.get("role") != "user" or last_turn.get("content") != message:
+            return None
+        return self.context_cache.get(self._context_cache_key(store, state, message, recent_messages))
+
+    @staticmethod
+    def _context_cache_key(
+        store: SessionStateStore,
+        state: SessionState,
+        message: str,
+        recent_messages: Optional[List[Dict[str, str]]],
+    ) -> str:
+        payload = [
+            store.lock_key(state.session_id),
+            message,
+            state.max_unlocked_chapter,
+            state.active_characters,
+            recent_messages,
+        ]
+        return hashlib.sha256(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+    def _finish_respond(
+        self,
+        store: SessionStateStore,
+        state: SessionState,
+        reply: str,
+        worldbook_context: Dict[str, Any],
+        citations: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        store.append_turn(state, role="assistant", content=reply)
         store.save(state)
-
         return {
-            "assistant_reply": final_reply,
+            "assistant_reply": reply,
             "citations": citations,
             "worldbook_context": worldbook_context,
         }
 
-    def get_session(self, session_id: str, session_store: Optional[SessionStateStore] = None) -> Dict[str, Any]:
+    def _grounding_call_kwargs(self, message: str, worldbook_context: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "prompt": self.guardrails.compose_grounding_prompt(message, worldbook_context),
+            "system_prompt": self.guardrails.build_grounding_system_prompt(),
+            "temperature": 0.4,
+        }
+
+    def _response_cache_key(self, call_kwargs: Dict[str, Any]) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        return ResponseCache.make_key(
+            call_kwargs["system_prompt"], call_kwargs["prompt"], call_kwargs["temperature"]
+        )
+
+    async def _acall_llm(self, **kwargs: Any) -> Any:
+        # Injected clients (tests, custom backends) may only implement the sync API.
+        acall = getattr(self.llm_client, "acall", None)
+        if acall is not None:
+            return await acall(**kwargs)
+        return await asyncio.to_thread(self.llm_client.call, **kwargs)
+
+    def load_session(self, session_id: str, session_store: Optional[SessionStateStore] = None) -> SessionState:
         store = session_store or self.session_store
-        state = store.load(session_id)
-        return state.to_dict()
+        return store.load(session_id)
+
+    def get_session(self, session_id: str, session_store: Optional[SessionStateStore] = None) -> Dict[str, Any]:
+        return self.load_session(session_id, session_store=session_store).to_dict()
+
+    async def aload_session(self, session_id: str, session_store: Optional[SessionStateStore] = None) -> SessionState:
+        return await asyncio.to_thread(self.load_session, session_id, session_store=session_store)
+
+    async def aget_session(self, session_id: str, session_store: Optional[SessionStateStore] = None) -> Dict[str, Any]:
+        return (await self.aload_session(session_id, session_store=session_store)).to_dict()
 
     def _fallback_reply(self, message: str, worldbook_context: Dict[str, Any]) -> str:
         facts = worldbook_context.get("facts", [])
         if not facts:
             return "当前没有足够证据支持回复，请提供更具体的问题。"
 
-        lines = ["根据当前证据："]
-        for item in facts[:3]:
-            source_chapter = item.get("source_chapter") or "unknown"
-            source_scene = item.get("source_scene")
-            source = f"{source_chapter} / scene {source_scene}" if source_scene is not None else source_chapter
-            lines.append(f"- {item.get('fact_text', '')}（{source}）")
+        return "\n".join(
+            [_FALLBACK_HEADER, *map(_format_fallback_fact, facts[:3]), _FALLBACK_FOOTER]
+        )
+
+
+class _ServiceSlot:
+    """A router-owned service plus the requests currently using it.
 
-        lines.append("如果你希望我继续推进剧情，请指定你要扮演的角色和当前目标。")
-        return "\n".join(lines)
+    Leases are counted under the slot's own lock, so cache hits never wait on the
+    router lock. A slot retired (evicted or invalidated) while leased closes its
+    service when the last lease is released; a retired slot takes no new leases.
+    """
+
+    __slots__ = ("service", "leases", "retired", "_lock")
+
+    def __init__(self, service: "RPQueryService"):
+        self.service = service
+        self.leases = 0
+        self.retired = False
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.retired:
+                return False
+            self.leases += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.leases -= 1
+            close_now = self.retired and self.leases == 0
+        if close_now:
+            self.service.close()
+
+    def retire(self) -> None:
+        with self._lock:
+            if self.retired:
+                return
+            self.retired = True
+            close_now = self.leases == 0
+        if close_now:
+            self.service.close()
 
 
 class MultiNovelRPQueryService:
@@ -216,28 +669,47 @@ class MultiNovelRPQueryService:
     def __init__(self, base_config: Dict[str, Any], novels: Optional[NovelsService] = None):
         self.base_config = base_config
         self.novels = novels
+        # Guards building, publishing and evicting services; lookups and leases on
+        # cached services do not take it.
         self._lock = threading.Lock()
-        self._services: Dict[str, RPQueryService] = {}
-        self._default_service: Optional[RPQueryService] = None
+        # LRU of per-novel services: each one holds a local Qdrant client, so keep
+        # only the most recently used novels open. Evicted services close once no
+        # in-flight request still uses them (see _ServiceSlot).
+        self._services: "OrderedDict[str, _ServiceSlot]" = OrderedDict()
+        rp_cfg = base_config.get("rp_query", {}) or {}
+        self.max_cached_novels = max(1, int(rp_cfg.get("max_cached_novels", 32) or 32))
+        # Builds in progress, so concurrent first requests for a novel share one
+        # construction (and one open of its local Qdrant store).
+        self._building: Dict[str, "Future[_ServiceSlot]"] = {}
+        self._default_slot: Optional[_ServiceSlot] = None
+        # Stateless, so one instance serves every novel. The LLM and embedding
+        # clients are shared process-wide via LLMClient.shared/EmbeddingClient.shared;
+        # query understanding and retrieval stay per novel (own dictionaries/vector DB).
+        self._guardrails = Guardrails()
 
     def invalidate(self, novel_id: str) -> None:
         novel_id = str(novel_id or "").strip()
         if not novel_id:
             return
         with self._lock:
-            self._services.pop(novel_id, None)
-
-    def _get_default(self) -> RPQueryService:
+            slot = self._services.pop(novel_id, None)
+        if slot is not None:
+            slot.retire()
+
+    def _get_default_slot(self) -> _ServiceSlot:
+        slot = self._default_slot
+        if slot is not None:
+            return slot
         with self._lock:
-            if self._default_service is None:
-                self._default_service = RPQueryService(config=self.base_config)
-            return self._default_service
-
-    def _build_service_for_novel(self, novel_id: str) -> RPQueryService:
-        if self.novels is None:
-            return self._get_default()
-
-        paths = self.novels.paths(novel_id)
+            if self._default_slot is None:
+                self._default_slot = _ServiceSlot(
+                    RPQueryService(config=self.base_config, guardrails=self._guardrails)
+                )
+            return self._default_slot
+
+    def _build_service_for_novel(self, record: NovelRecord) -> RPQueryService:
+        paths = self.novels.record_paths(record)
+        # Shallow copies are enough: only the `paths` section is overridden per novel.
         config = dict(self.base_config)
         config_paths = dict((self.base_config.get("paths") or {}))
         config_paths.update(
@@ -253,57 +725,162 @@ class MultiNovelRPQueryService:
         )
         config["paths"] = config_paths
 
-        return RPQueryService(config=config)
+        return RPQueryService(config=config, guardrails=self._guardrails)
+
+    def _touch(self, novel_id: str) -> None:
+        # Recency is bumped only when the lock is free right now, so readers never
+        # wait (LRU order is approximate).
+        if self._lock.acquire(blocking=False):
+            try:
+                if novel_id in self._services:
+                    self._services.move_to_end(novel_id)
+            finally:
+                self._lock.release()
 
     def get_service(self, novel_id: Optional[str]) -> RPQueryService:
+        """Return the novel's service without holding it open (see `_checkout`)."""
         novel_id = str(novel_id or "").strip()
         if not novel_id:
-            return self._get_default()
+            return self._get_default_slot().service
+        # Hot path: a single dict lookup, no lock.
+        slot = self._services.get(novel_id)
+        if slot is None:
+            return self._resolve(novel_id).service
+        self._touch(novel_id)
+        return slot.service
+
+    def _checkout(self, novel_id: Optional[str]) -> _ServiceSlot:
+        """Return the novel's slot with a lease held; pair with `_release`."""
+        novel_id = str(novel_id or "").strip()
+        if not novel_id:
+            slot = self._get_default_slot()
+            slot.acquire()  # never retired
+            return slot
+        while True:
+            # Hot path: a dict lookup and the slot's own lock, never the router lock.
+            slot = self._services.get(novel_id)
+            if slot is not None:
+                if slot.acquire():
+                    self._touch(novel_id)
+                    return slot
+                continue  # retired between lookup and lease; look again
+            slot = self._resolve(novel_id)
+            if slot.acquire():
+                return slot
+
+    def _release(self, slot: _ServiceSlot) -> None:
+        slot.release()
+
+    @contextlib.contextmanager
+    def _leased(self, novel_id: Optional[str]) -> Iterator[RPQueryService]:
+        slot = self._checkout(novel_id)
+        try:
+            yield slot.service
+        finally:
+            self._release(slot)
 
-        with self._lock:
-            cached = self._services.get(novel_id)
-            if cached is not None:
-                return cached
+    def _resolve(self, novel_id: str) -> _ServiceSlot:
+        """Slow path: find or build the novel's slot under the router lock."""
+        if self.novels is None:
+            return self._get_default_slot()
 
-        # Ensure novel exists (outside lock to avoid blocking other callers).
-        if self.novels is not None:
-            self.novels.get(novel_id)
+        with self._lock:
+            slot = self._services.get(novel_id)
+            if slot is not None:
+                return slot
+            pending = self._building.get(novel_id)
+            building = pending is None
+            if building:
+                pending = Future()
+                self._building[novel_id] = pending
+        if not building:
+            return pending.result()
 
-        service = self._build_service_for_novel(novel_id)
+        try:
+            # Ensure novel exists (outside the lock so other novels are not blocked);
+            # the fetched record also yields the workspace paths without a second lookup.
+            record = self.novels.get(novel_id)
+            slot = _ServiceSlot(self._build_service_for_novel(record))
+        except BaseException as exc:
+            with self._lock:
+                self._building.pop(novel_id, None)
+            pending.set_exception(exc)
+            raise
+
+        evicted: List[_ServiceSlot] = []
         with self._lock:
-            self._services[novel_id] = service
-        return service
+            self._building.pop(novel_id, None)
+            self._services[novel_id] = slot
+            while len(self._services) > self.max_cached_novels:
+                evicted.append(self._services.popitem(last=False)[1])
+        pending.set_result(slot)
+        for stale in evicted:
+            stale.retire()
+        return slot
+
+    async def awarmup(self, novel_id: str) -> None:
+        """Build (or keep) the novel's service ahead of its first query."""
+        await asyncio.to_thread(self.get_service, novel_id)
 
     def query_context(self, novel_id: Optional[str], **kwargs: Any) -> Dict[str, Any]:
-        return self.get_service(novel_id).query_context(**kwargs)
+        with self._leased(novel_id) as service:
+            return service.query_context(**kwargs)
 
     def respond(self, novel_id: Optional[str], **kwargs: Any) -> Dict[str, Any]:
-        return self.get_service(novel_id).respond(**kwargs)
+        with self._leased(novel_id) as service:
+            return service.respond(**kwargs)
 
     def get_session(self, novel_id: Optional[str], session_id: str, **kwargs: Any) -> Dict[str, Any]:
-        return self.get_service(novel_id).get_session(session_id, **kwargs)
+        with self._leased(novel_id) as service:
+            return service.get_session(session_id, **kwargs)
+
+    # Async variants: building a per-novel service opens Qdrant/LLM clients, so
+    # resolve it off the event loop as well.
+    async def aquery_context(self, novel_id: Optional[str], **kwargs: Any) -> Dict[str, Any]:
+        slot = await asyncio.to_thread(self._checkout, novel_id)
+        try:
+            return await slot.service.aquery_context(**kwargs)
+        finally:
+            self._release(slot)
+
+    async def arespond(self, novel_id: Optional[str], **kwargs: Any) -> Dict[str, Any]:
+        slot = await asyncio.to_thread(self._checkout, novel_id)
+        try:
+            return await slot.service.arespond(**kwargs)
+        finally:
+            self._release(slot)
+
+    async def aload_session(self, novel_id: Optional[str], session_id: str, **kwargs: Any) -> SessionState:
+        slot = await asyncio.to_thread(self._checkout, novel_id)
+        try:
+            return await slot.service.aload_session(session_id, **kwargs)
+        finally:
+            self._release(slot)
 
 
 def create_app(config_file: str = "config.yaml"):
     """Create FastAPI app lazily so dependency stays optional."""
     try:
         from fastapi import Depends, FastAPI, File, HTTPException, Request, Response, UploadFile
+        from fastapi.exception_handlers import request_validation_exception_handler
+        from fastapi.exceptions import RequestValidationError
         from fastapi.middleware.cors import CORSMiddleware
-        from fastapi.responses import FileResponse
+        from fastapi.responses import FileResponse, JSONResponse
+
+        from api.request_models import PipelineRunRequest, RespondRequest, RPRequest, validation_error_detail
     except ImportError as exc:  # pragma: no cover - optional runtime path
         raise RuntimeError(
             "FastAPI is not installed. Install with `pip install fastapi uvicorn`."
         ) from exc
 
-    with open(config_file, "r", encoding="utf-8") as f:
-        base_config = yaml.safe_load(f)
+    base_config = _load_config_file(config_file)
 
     data_root = _derive_data_root(base_config)
     vector_db_root = str(base_config.get("paths", {}).get("vector_db_path") or "/app/vector_db")
     logs_root = str(base_config.get("paths", {}).get("log_dir") or "/app/logs")
 
     db_path = str(base_config.get("paths", {}).get("db_path") or os.path.join(data_root, "airp2.sqlite3"))
-    db = Database(path=db_path)
+    db = Database(path=db_path, synchronous=str(base_config.get("paths", {}).get("db_synchronous") or "FULL"))
     db.init_schema()
 
     layout = StorageLayout(data_root=data_root, vector_db_root=vector_db_root, logs_root=logs_root)
@@ -315,6 +892,8 @@ def create_app(config_file: str = "config.yaml"):
         cookie_name=str(auth_cfg.get("cookie_name", "airp_sid")),
         user_session_days=int(auth_cfg.get("user_session_days", 30) or 30),
         guest_session_days=int(auth_cfg.get("guest_session_days", 30) or 30),
+        session_cache_ttl_s=float(auth_cfg.get("session_cache_ttl_s", 30) or 0),
+        touch_interval_s=float(auth_cfg.get("session_touch_interval_s", 60) or 0),
     )
 
     rp_router = MultiNovelRPQueryService(base_config=base_config, novels=novels)
@@ -340,9 +919,84 @@ def create_app(config_file: str = "config.yaml"):
         max_concurrent_jobs=1,
         on_job_update=_on_job_update,
     )
-    app = FastAPI(title="RP Query API", version="1.0.0")
+    default_response_class = JSONResponse
+    loads_json = json.loads
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - orjson is optional
+        pass
+    else:
+        loads_json = orjson.loads
+
+        class _ORJSONResponse(JSONResponse):
+            # Same contract as JSONResponse, encoded by orjson (UTF-8, no ASCII escaping).
+            def render(self, content: Any) -> bytes:
+                return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+        default_response_class = _ORJSONResponse
 
     web_cfg = dict(base_config.get("web", {}) or {})
+    threadpool_size = max(1, int(web_cfg.get("threadpool_size", 64) or 64))
+    # Each upload holds a copy worker plus an encoding/stat pass over up to 50MB.
+    upload_slots = asyncio.Semaphore(max(1, int(web_cfg.get("max_concurrent_uploads", 4) or 4)))
+
+    rp_cfg = dict(base_config.get("rp_query", {}) or {})
+    # Opt-in write-behind for file sessions: saves are coalesced in memory and
+    # flushed every session_flush_interval_ms (and on shutdown).
+    flush_interval_s = float(rp_cfg.get("session_flush_interval_ms", 0) or 0) / 1000.0
+    session_writes = SessionWriteBuffer() if flush_interval_s > 0 else None
+
+    @contextlib.asynccontextmanager
+    async def _lifespan(_app: Any):
+        # Blocking work (retrieval, session files, sync routes) runs in threads; the
+        # stock pools (anyio: 40, asyncio: min(32, cpu + 4)) cap in-flight requests.
+        import anyio.to_thread
+        from concurrent.futures import ThreadPoolExecutor
+
+        anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size
+        executor = ThreadPoolExecutor(max_workers=threadpool_size, thread_name_prefix="rp-api")
+        asyncio.get_running_loop().set_default_executor(executor)
+        flush_task = None
+        if session_writes is not None:
+            flush_task = asyncio.create_task(session_writes.run(flush_interval_s))
+        try:
+            yield
+        finally:
+            if flush_task is not None:
+                flush_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await flush_task
+                session_writes.flush()
+            # Only services that talk to the LLM import the client module.
+            llm_client_module = sys.modules.get("utils.llm_client")
+            if llm_client_module is not None:
+                await llm_client_module.LLMClient.aclose_shared()
+            executor.shutdown(wait=False)
+            db.close()
+
+    app = FastAPI(
+        title="RP Query API",
+        version="1.0.0",
+        default_response_class=default_response_class,
+        lifespan=_lifespan,
+    )
+
+    # Routes whose bodies used to be checked by hand and answered with 400.
+    model_body_routes = {
+        "/api/v1/rp/query-context",
+        "/api/v1/rp/respond",
+        "/api/v1/novels/{novel_id}/pipeline/run",
+    }
+
+    @app.exception_handler(RequestValidationError)
+    async def _reject_invalid_request(request: Request, exc: RequestValidationError):
+        # Clients read `detail` from these routes as one message, like every other
+        # 4xx here, so keep their 400 + string shape; other routes keep FastAPI's 422.
+        route = request.scope.get("route")
+        if getattr(route, "path", None) not in model_body_routes:
+            return await request_validation_exception_handler(request, exc)
+        return JSONResponse(status_code=400, content={"detail": validation_error_detail(exc.errors())})
+
     cors_origins = list(web_cfg.get("cors_origins") or [])
     if not cors_origins:
         cors_origins = ["http://localhost:5173"]
@@ -354,6 +1008,9 @@ def create_app(config_file: str = "config.yaml"):
         allow_headers=["*"],
     )
 
+    # Shared by the per-request file session stores below; keyed by session file path.
+    session_cache = SessionStateCache(maxsize=int(rp_cfg.get("session_cache_size", 1024)))
+
     cookie_secure = bool(auth_cfg.get("cookie_secure", False))
     cookie_samesite = str(auth_cfg.get("cookie_samesite", "lax") or "lax")
 
@@ -389,11 +1046,32 @@ def create_app(config_file: str = "config.yaml"):
     def _session_store(actor: Actor, novel_id: Optional[str]) -> SessionStateStore:
         if actor.is_user:
             base_dir = layout.sessions_scope_dir(user_id=actor.user_id, novel_id=novel_id or None)
+            owner_scope = f"user:{actor.user_id}"
         else:
             guest_id = actor.guest_id or "anonymous"
             base_dir = layout.sessions_scope_dir(guest_id=guest_id, novel_id=novel_id or None)
-        os.makedirs(base_dir, exist_ok=True)
-        return SessionStateStore(base_dir=base_dir)
+            owner_scope = f"guest:{guest_id}"
+        # Same namespace as the directory layout, for the Redis backend.
+        key_scope = f"{owner_scope}:novels:{novel_id}" if novel_id else f"{owner_scope}:global"
+        return _session_store_for_scope(base_dir, key_scope)
+
+    # Stores hold only their location and settings (state lives in session_cache or
+    # Redis), so one instance per session scope can be shared across requests.
+    @functools.lru_cache(maxsize=1024)
+    def _session_store_for_scope(base_dir: str, key_scope: str) -> SessionStateStore:
+        return build_session_store(
+            rp_cfg,
+            base_dir=base_dir,
+            key_scope=key_scope,
+            cache=session_cache,
+            write_buffer=session_writes,
+        )
+
+    def _rp_session_store(actor: Actor, novel_id: Optional[str]) -> SessionStateStore:
+        # Blocking (SQLite); async RP handlers call this via a worker thread.
+        if novel_id:
+            _assert_can_read(actor, str(novel_id))
+        return _session_store(actor, str(novel_id) if novel_id else None)
 
     def _assert_can_read(actor: Actor, novel_id: str) -> None:
         actor_user_id = actor.user_id if actor.is_user else None
@@ -525,103 +1203,89 @@ def create_app(config_file: str = "config.yaml"):
 
     @app.post("/api/v1/novels/{novel_id}/upload")
     async def upload_novel(novel_id: str, actor: Actor = Depends(require_user), file: UploadFile = File(...)):
-        _assert_owner(actor, novel_id)
+        record = await asyncio.to_thread(_assert_owner, actor, novel_id)
 
         filename = str(getattr(file, "filename", "") or "")
         if not filename.lower().endswith(".txt"):
             raise HTTPException(status_code=400, detail="only .txt files are supported")
 
-        paths = novels.paths(novel_id)
-        os.makedirs(paths["input_dir"], exist_ok=True)
+        # Reuse the ownership-checked record instead of fetching the novel again.
+        paths = novels.record_paths(record)
         dst_path = paths["source_file"]
 
         max_bytes = 50 * 1024 * 1024
-        total = 0
-        try:
-            with open(dst_path, "wb") as f:
-                while True:
-                    chunk = await file.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    total += len(chunk)
-                    if total > max_bytes:
-                        raise HTTPException(status_code=413, detail="file too large (limit 50MB)")
-                    f.write(chunk)
-        finally:
+        async with upload_slots:
+            # The upload is already spooled by the server; copy it to the workspace in
+            # one worker thread so the event loop never blocks on disk writes.
             try:
-                await file.close()
-            except Exception:
-                pass
-
-        meta: Dict[str, Any] = {"filename": filename, "bytes": total}
-        try:
-            from utils.text_utils import read_text_file
-
-            text = read_text_file(dst_path)
-            meta["char_count"] = len(text)
-            meta["line_count"] = len(text.splitlines())
-        except Exception:
-            pass
-
-        novels.update_source_meta(actor.user_id or "", novel_id, meta)
-        rp_router.invalidate(novel_id)
+                total, encoding, stats = await asyncio.to_thread(
+                    _copy_upload, file.file, dst_path, max_bytes
+                )
+            finally:
+                try:
+                    await file.close()
+                except Exception:
+                    pass
+            if total > max_bytes:
+                raise HTTPException(status_code=413, detail="file too large (limit 50MB)")
+
+            meta: Dict[str, Any] = {"filename": filename, "bytes": total}
+            if stats is not None:
+                meta.update(stats)
+            else:
+                try:
+                    meta.update(await asyncio.to_thread(_describe_text_file, dst_path, encoding))
+                except Exception:
+                    pass
+
+        await asyncio.to_thread(novels.update_source_meta, actor.user_id or "", novel_id, meta)
+        # Invalidation may close the novel's Qdrant client, so keep it off the loop too.
+        await asyncio.to_thread(rp_router.invalidate, novel_id)
 
         return {"uploaded": True, "novel_id": novel_id, "source": meta}
 
     @app.get("/api/v1/novels/{novel_id}/source")
     def get_novel_source(novel_id: str, actor: Actor = Depends(require_user)):
-        entry = _assert_owner(actor, novel_id).to_entry_dict()
+        record = _assert_owner(actor, novel_id)
 
-        paths = novels.paths(novel_id)
+        paths = novels.record_paths(record)
         if not os.path.exists(paths["source_file"]):
             raise HTTPException(status_code=404, detail="source not uploaded")
 
-        return entry.get("source", {}) or {}
+        return record.source or {}
 
     @app.get("/api/v1/novels/{novel_id}/pipeline/chapter-index")
     def get_pipeline_chapter_index(novel_id: str, actor: Actor = Depends(require_user)):
-        _assert_owner(actor, novel_id)
+        record = _assert_owner(actor, novel_id)
 
-        paths = novels.paths(novel_id)
+        paths = novels.record_paths(record)
         index_file = os.path.join(paths["chapters_dir"], "chapter_index.json")
-        if not os.path.exists(index_file):
+        try:
+            with open(index_file, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="chapter index not found (run step1 first)")
-
+        except OSError as exc:
+            raise HTTPException(status_code=500, detail=f"failed to read chapter index: {exc}")
         try:
-            with open(index_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            # Validate only; the file is already JSON, so send its bytes unchanged.
+            loads_json(raw)
         except Exception as exc:
             raise HTTPException(status_code=500, detail=f"failed to read chapter index: {exc}")
+        return Response(content=raw, media_type="application/json")
 
     @app.post("/api/v1/novels/{novel_id}/pipeline/run")
-    def run_pipeline(novel_id: str, payload: Dict[str, Any], actor: Actor = Depends(require_user)):
-        _assert_owner(actor, novel_id)
-
-        step = payload.get("step")
-        if step is not None:
-            try:
-                step = int(step)
-            except Exception:
-                raise HTTPException(status_code=400, detail="step must be an integer 1..5")
-            if step not in {1, 2, 3, 4, 5}:
-                raise HTTPException(status_code=400, detail="step must be in [1,2,3,4,5]")
+    def run_pipeline(novel_id: str, payload: PipelineRunRequest, actor: Actor = Depends(require_user)):
+        record = _assert_owner(actor, novel_id)
 
-        redo_chapter = payload.get("redo_chapter")
-        if redo_chapter is not None:
-            try:
-                redo_chapter = int(redo_chapter)
-            except Exception:
-                raise HTTPException(status_code=400, detail="redo_chapter must be an integer")
+        if payload.step is not None and payload.step not in {1, 2, 3, 4, 5}:
+            raise HTTPException(status_code=400, detail="step must be in [1,2,3,4,5]")
 
-        spec = PipelineRunSpec(
-            step=step,
-            force=bool(payload.get("force", False)),
-            redo_chapter=redo_chapter,
-        )
+        spec = PipelineRunSpec(step=payload.step, force=payload.force, redo_chapter=payload.redo_chapter)
 
-        paths = novels.paths(novel_id)
-        os.makedirs(paths["log_dir"], exist_ok=True)
-        job_id = uuid.uuid4().hex
+        paths = novels.record_paths(record)
+        # The job's log directory is created by the runner when logging starts.
+        job_id = secrets.token_hex(16)
         log_path = os.path.join(paths["log_dir"], f"job_{job_id}.log")
 
         try:
@@ -655,67 +1319,61 @@ def create_app(config_file: str = "config.yaml"):
         text = jobs.tail_logs(job_id, lines=lines)
         return {"job_id": job_id, "lines": lines, "text": text}
 
-    @app.post("/api/v1/rp/query-context")
-    def query_context(payload: Dict[str, Any], actor: Actor = Depends(get_or_create_actor)):
+    @app.post("/api/v1/novels/{novel_id}/warmup")
+    async def warmup_novel(novel_id: str, actor: Actor = Depends(get_or_create_actor)):
+        # Opens the novel's retrieval stack now so the first RP query does not pay for it.
+        await asyncio.to_thread(_assert_can_read, actor, novel_id)
         try:
-            message = payload["message"]
-            session_id = payload["session_id"]
+            await rp_router.awarmup(novel_id)
         except KeyError as exc:
-            raise HTTPException(status_code=400, detail=f"missing field: {exc.args[0]}")
-
-        novel_id = payload.get("novel_id")
-        if novel_id:
-            _assert_can_read(actor, str(novel_id))
+            raise HTTPException(status_code=404, detail=str(exc))
+        return {"warmed": True, "novel_id": novel_id}
 
-        store = _session_store(actor, str(novel_id) if novel_id else None)
+    @app.post("/api/v1/rp/query-context")
+    async def query_context(payload: RPRequest, actor: Actor = Depends(get_or_create_actor)):
+        novel_id = payload.novel_id
+        store = await asyncio.to_thread(_rp_session_store, actor, novel_id)
         try:
-            return rp_router.query_context(
+            return await rp_router.aquery_context(
                 novel_id,
-                message=message,
-                session_id=session_id,
-                unlocked_chapter=payload.get("unlocked_chapter"),
-                active_characters=payload.get("active_characters"),
-                recent_messages=payload.get("recent_messages"),
+                message=payload.message,
+                session_id=payload.session_id,
+                unlocked_chapter=payload.unlocked_chapter,
+                active_characters=payload.active_characters,
+                recent_messages=payload.recent_messages,
                 session_store=store,
             )
         except KeyError as exc:
             raise HTTPException(status_code=404, detail=str(exc))
 
     @app.post("/api/v1/rp/respond")
-    def respond(payload: Dict[str, Any], actor: Actor = Depends(get_or_create_actor)):
-        try:
-            message = payload["message"]
-            session_id = payload["session_id"]
-        except KeyError as exc:
-            raise HTTPException(status_code=400, detail=f"missing field: {exc.args[0]}")
-
-        novel_id = payload.get("novel_id")
-        if novel_id:
-            _assert_can_read(actor, str(novel_id))
-        store = _session_store(actor, str(novel_id) if novel_id else None)
+    async def respond(payload: RespondRequest, actor: Actor = Depends(get_or_create_actor)):
+        message = payload.message
+        session_id = payload.session_id
+        novel_id = payload.novel_id
+        store = await asyncio.to_thread(_rp_session_store, actor, novel_id)
 
         # Guest/no-novel mode: allow LLM chat without RAG evidence.
         if not novel_id:
-            llm_client = LLMClient(base_config)
-            state = store.load(session_id, default_unlocked=int(payload.get("unlocked_chapter") or 0))
-            recent = payload.get("recent_messages")
-            history = recent if isinstance(recent, list) else state.turns[-10:]
-            store.append_turn(state, role="user", content=str(message))
-            system_prompt = "你是 AIRP 的聊天助手。无需引用证据，回答要清晰、有帮助。"
-            user_prompt = "对话上下文：\n"
-            for turn in history[-10:]:
-                role = str(turn.get("role") or "")
-                content = str(turn.get("content") or "")
-                if role and content:
-                    user_prompt += f"- {role}: {content}\n"
-            user_prompt += f"\n用户：{message}\n助手："
-            try:
-                reply = llm_client.call(prompt=user_prompt, system_prompt=system_prompt, temperature=0.7)
-            except Exception as exc:
-                reply = f"请求失败：{exc}"
-            final = str(reply)
-            store.append_turn(state, role="assistant", content=final)
-            store.save(state)
+            from utils.llm_client import LLMClient
+
+            # Same process-wide client (and keep-alive pool) the per-novel services use.
+            llm_client = LLMClient.shared(base_config)
+            async with SESSION_LOCKS.hold(store.lock_key(session_id)):
+                state = await asyncio.to_thread(
+                    store.load, session_id, default_unlocked=payload.unlocked_chapter or 0
+                )
+                recent = payload.recent_messages
+                history = recent if recent is not None else state.recent_turns()
+                store.append_turn(state, role="user", content=message)
+                user_prompt = _format_guest_prompt(history[-10:], message)
+                try:
+                    reply = await llm_client.acall(prompt=user_prompt, system_prompt=_GUEST_SYSTEM_PROMPT, temperature=0.7)
+                except Exception as exc:
+                    reply = f"请求失败：{exc}"
+                final = str(reply)
+                store.append_turn(state, role="assistant", content=final)
+                await asyncio.to_thread(store.save, state)
             return {
                 "assistant_reply": final,
                 "citations": [],
@@ -723,48 +1381,72 @@ def create_app(config_file: str = "config.yaml"):
             }
 
         try:
-            return rp_router.respond(
+            return await rp_router.arespond(
                 novel_id,
                 message=message,
                 session_id=session_id,
-                worldbook_context=payload.get("worldbook_context"),
-                citations=payload.get("citations"),
-                unlocked_chapter=payload.get("unlocked_chapter"),
-                active_characters=payload.get("active_characters"),
-                recent_messages=payload.get("recent_messages"),
+                worldbook_context=payload.worldbook_context,
+                citations=payload.citations,
+                unlocked_chapter=payload.unlocked_chapter,
+                active_characters=payload.active_characters,
+                recent_messages=payload.recent_messages,
                 session_store=store,
             )
         except KeyError as exc:
             raise HTTPException(status_code=404, detail=str(exc))
 
     @app.get("/api/v1/rp/session/{session_id}")
-    def get_session(session_id: str, novel_id: Optional[str] = None, actor: Actor = Depends(get_or_create_actor)):
-        if novel_id:
-            _assert_can_read(actor, str(novel_id))
-        store = _session_store(actor, str(novel_id) if novel_id else None)
+    async def get_session(
+        session_id: str,
+        request: Request,
+        response: Response,
+        novel_id: Optional[str] = None,
+        actor: Actor = Depends(get_or_create_actor),
+    ):
+        store = await asyncio.to_thread(_rp_session_store, actor, novel_id)
         try:
-            return rp_router.get_session(novel_id, session_id, session_store=store)
+            state = await rp_router.aload_session(novel_id, session_id, session_store=store)
         except KeyError as exc:
             raise HTTPException(status_code=404, detail=str(exc))
 
+        # Polling clients revalidate with If-None-Match; skip serializing unchanged state.
+        etag = _session_etag(state)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return state.to_dict()
+
     frontend_dist = Path(__file__).resolve().parents[1] / "frontend" / "dist"
-    if frontend_dist.exists():
-        index_file = frontend_dist / "index.html"
+    index_file = frontend_dist / "index.html"
+    if index_file.is_file():
+        # The built bundle is immutable while the server runs: resolve the file table
+        # and the SPA shell once instead of resolve()/stat() per request.
+        index_html = index_file.read_bytes()
+        static_files = _scan_static_files(frontend_dist)
+        # Vite emits content-hashed file names under assets/, so browsers may keep
+        # them forever; the SPA shell is revalidated so new builds are picked up.
+        asset_headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+        index_headers = {"Cache-Control": "no-cache"}
 
         @app.get("/", include_in_schema=False)
-        def serve_frontend_root():
-            return FileResponse(index_file)
+        async def serve_frontend_root():
+            return Response(content=index_html, media_type="text/html", headers=index_headers)
 
-        @app.get("/{full_path:path}", include_in_schema=False)
-        def serve_frontend(full_path: str):
-            if full_path.startswith("api/"):
-                raise HTTPException(status_code=404, detail="Not found")
-
-            requested = (frontend_dist / full_path).resolve()
-            if requested.is_relative_to(frontend_dist) and requested.is_file():
-                return FileResponse(requested)
+        # Registered after every API route and before the SPA catch-all, so unknown
+        # API paths are rejected by routing instead of a check in serve_frontend.
+        @app.get("/api/{api_path:path}", include_in_schema=False)
+        async def reject_unknown_api(api_path: str):
+            raise HTTPException(status_code=404, detail="Not found")
 
-            return FileResponse(index_file)
+        @app.get("/{full_path:path}", include_in_schema=False)
+        async def serve_frontend(full_path: str):
+            static_file = static_files.get(full_path)
+            if static_file is not None:
+                if full_path.startswith("assets/"):
+                    return FileResponse(static_file, headers=asset_headers)
+                return FileResponse(static_file)
+
+            return Response(content=index_html, media_type="text/html", headers=index_headers)
 
     return app
 
@@ -1,14 +1,83 @@
 """Example usage of the vectorized novel database."""
+import atexit
+import functools
 import json
-import yaml
-from qdrant_client import QdrantClient
-from utils.embedding_client import EmbeddingClient
+import sys
+from collections import Counter
+from qdrant_client import QdrantClient, models
+from utils.config_loader import load_yaml_config
 
 
 def load_config():
     """Load configuration."""
-    with open('config.yaml', 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return load_yaml_config('config.yaml')
+
+
+@functools.lru_cache(maxsize=1)
+def get_config():
+    """Configuration shared by all examples (parsed once)."""
+    return load_config()
+
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """Qdrant client shared by all examples (the local database is opened once)."""
+    client = QdrantClient(path=get_config()['paths']['vector_db_path'])
+    atexit.register(client.close)
+    return client
+
+
+def _iter_scroll(client, collection_name, payload_fields, batch=512):
+    """Yield the payload of every point, paging with next_page_offset."""
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch,
+            offset=offset,
+            with_payload=models.PayloadSelectorInclude(include=payload_fields),
+            with_vectors=False
+        )
+        for point in points:
+            yield point.payload
+        if offset is None:
+            return
+
+
+# Examples 1, 4 and 5 all look at the same character; fetch their scenes once.
+DEMO_CHARACTER = "林风"
+_CHARACTER_SCENE_FIELDS = [
+    "chapter", "chapter_title", "scene_index", "event_summary", "characters",
+    "location", "emotion_tone", "key_dialogues", "plot_significance",
+]
+
+
+# Example 2's filter never changes; build the model once instead of per call.
+DEMO_LOCATION = "客栈"
+DEMO_LOCATION_FILTER = models.Filter(must=[
+    models.FieldCondition(key="location", match=models.MatchValue(value=DEMO_LOCATION))
+])
+
+
+@functools.lru_cache(maxsize=8)
+def character_scenes(character, limit=100):
+    """Payloads of up to `limit` scenes featuring `character`, in chapter order."""
+    points, _ = get_client().scroll(
+        collection_name=get_config()['vector_db']['collection_name'],
+        scroll_filter=models.Filter(must=[
+            models.FieldCondition(key="characters", match=models.MatchAny(any=[character]))
+        ]),
+        # Qdrant walks the integer chapter_no index in order.
+        order_by=models.OrderBy(key="chapter_no"),
+        limit=limit,
+        with_payload=models.PayloadSelectorInclude(include=_CHARACTER_SCENE_FIELDS),
+        with_vectors=False
+    )
+    # Scene order within each chapter (already chapter-ordered, so this is cheap).
+    return sorted(
+        (point.payload for point in points),
+        key=lambda payload: (payload['chapter'], payload['scene_index'])
+    )
 
 
 def example_search_by_character():
@@ -17,38 +86,20 @@ def example_search_by_character():
     print("Example 1: Search by Character")
     print("=" * 60)
 
-    config = load_config()
-    client = QdrantClient(path=config['paths']['vector_db_path'])
-    collection_name = config['vector_db']['collection_name']
-
     # Search for scenes with specific character
-    character_name = "林风"
+    character_name = DEMO_CHARACTER
+    scenes = character_scenes(character_name)[:5]
 
-    results = client.scroll(
-        collection_name=collection_name,
-        scroll_filter={
-            "must": [
-                {
-                    "key": "characters",
-                    "match": {"any": [character_name]}
-                }
-            ]
-        },
-        limit=5,
-        with_payload=True,
-        with_vectors=False
-    )
-
-    print(f"\nFound {len(results[0])} scenes with character '{character_name}':\n")
+    print(f"\nFound {len(scenes)} scenes with character '{character_name}':\n")
 
-    for i, point in enumerate(results[0], 1):
-        payload = point.payload
-        print(f"{i}. [{payload['chapter_title']}] Scene {payload['scene_index']}")
-        print(f"   Event: {payload['event_summary']}")
-        print(f"   Characters: {', '.join(payload['characters'])}")
-        print(f"   Location: {payload['location']}")
-        print(f"   Emotion: {payload['emotion_tone']}")
-        print()
+    sys.stdout.write("".join(
+        f"{i}. [{payload['chapter_title']}] Scene {payload['scene_index']}\n"
+        f"   Event: {payload['event_summary']}\n"
+        f"   Characters: {', '.join(payload['characters'])}\n"
+        f"   Location: {payload['location']}\n"
+        f"   Emotion: {payload['emotion_tone']}\n\n"
+        for i, payload in enumerate(scenes, 1)
+    ))
 
 
 def example_search_by_location():
@@ -57,36 +108,31 @@ def example_search_by_location():
     print("Example 2: Search by Location")
     print("=" * 60)
 
-    config = load_config()
-    client = QdrantClient(path=config['paths']['vector_db_path'])
+    config = get_config()
+    client = get_client()
     collection_name = config['vector_db']['collection_name']
 
     # Search for scenes at specific location
-    location = "客栈"
+    location = DEMO_LOCATION
 
     results = client.scroll(
         collection_name=collection_name,
-        scroll_filter={
-            "must": [
-                {
-                    "key": "location",
-                    "match": {"value": location}
-                }
-            ]
-        },
+        scroll_filter=DEMO_LOCATION_FILTER,
         limit=10,
-        with_payload=True,
+        with_payload=models.PayloadSelectorInclude(
+            include=["event_summary", "chapter_title", "characters"]
+        ),
         with_vectors=False
     )
 
     print(f"\nFound {len(results[0])} scenes at location '{location}':\n")
 
-    for i, point in enumerate(results[0], 1):
-        payload = point.payload
-        print(f"{i}. {payload['event_summary']}")
-        print(f"   Chapter: {payload['chapter_title']}")
-        print(f"   Characters: {', '.join(payload['characters'])}")
-        print()
+    sys.stdout.write("".join(
+        f"{i}. {point.payload['event_summary']}\n"
+        f"   Chapter: {point.payload['chapter_title']}\n"
+        f"   Characters: {', '.join(point.payload['characters'])}\n\n"
+        for i, point in enumerate(results[0], 1)
+    ))
 
 
 def example_semantic_search():
@@ -95,37 +141,40 @@ def example_semantic_search():
     print("Example 3: Semantic Search")
     print("=" * 60)
 
-    config = load_config()
-    client = QdrantClient(path=config['paths']['vector_db_path'])
+    config = get_config()
+    client = get_client()
     collection_name = config['vector_db']['collection_name']
 
-    # Generate query vector
-    embedding_client = EmbeddingClient(config)
+    # Generate query vector (the openai SDK is only imported for this example)
+    from utils.embedding_client import EmbeddingClient
+
+    embedding_client = EmbeddingClient.shared(config)
 
     query_text = "林风和沈小姐在藏书楼寻找秘籍"
     print(f"\nQuery: {query_text}\n")
 
-    query_vector = embedding_client.embed([query_text])[0]
+    query_vector = embedding_client.embed_query(query_text)
 
     # Search
     results = client.search(
         collection_name=collection_name,
         query_vector=query_vector,
-        limit=3
+        limit=3,
+        with_payload=models.PayloadSelectorInclude(
+            include=["chapter_title", "event_summary", "characters", "location", "text"]
+        )
     )
 
     print(f"Top {len(results)} most relevant scenes:\n")
 
-    for i, result in enumerate(results, 1):
-        payload = result.payload
-        score = result.score
-
-        print(f"{i}. [Score: {score:.4f}] {payload['chapter_title']}")
-        print(f"   Event: {payload['event_summary']}")
-        print(f"   Characters: {', '.join(payload['characters'])}")
-        print(f"   Location: {payload['location']}")
-        print(f"   Text preview: {payload['text'][:100]}...")
-        print()
+    sys.stdout.write("".join(
+        f"{i}. [Score: {result.score:.4f}] {result.payload['chapter_title']}\n"
+        f"   Event: {result.payload['event_summary']}\n"
+        f"   Characters: {', '.join(result.payload['characters'])}\n"
+        f"   Location: {result.payload['location']}\n"
+        f"   Text preview: {result.payload['text'][:100]}...\n\n"
+        for i, result in enumerate(results, 1)
+    ))
 
 
 def example_combined_filter():
@@ -134,43 +183,25 @@ def example_combined_filter():
     print("Example 4: Combined Filters")
     print("=" * 60)
 
-    config = load_config()
-    client = QdrantClient(path=config['paths']['vector_db_path'])
-    collection_name = config['vector_db']['collection_name']
-
-    # Search for high-significance scenes with specific character
-    character = "林风"
+    # High-significance scenes with specific character, narrowed from the
+    # character's scenes fetched once for examples 1/4/5 (within their window).
+    character = DEMO_CHARACTER
     significance = "high"
-
-    results = client.scroll(
-        collection_name=collection_name,
-        scroll_filter={
-            "must": [
-                {
-                    "key": "characters",
-                    "match": {"any": [character]}
-                },
-                {
-                    "key": "plot_significance",
-                    "match": {"value": significance}
-                }
-            ]
-        },
-        limit=5,
-        with_payload=True,
-        with_vectors=False
-    )
+    scenes = [
+        payload for payload in character_scenes(character)
+        if payload.get('plot_significance') == significance
+    ][:5]
 
     print(f"\nHigh-significance scenes with '{character}':\n")
 
-    for i, point in enumerate(results[0], 1):
-        payload = point.payload
-        print(f"{i}. [{payload['chapter_title']}]")
-        print(f"   Event: {payload['event_summary']}")
-        print(f"   Emotion: {payload['emotion_tone']}")
-        if payload.get('key_dialogues'):
-            print(f"   Key dialogue: {payload['key_dialogues'][0]}")
-        print()
+    sys.stdout.write("".join(
+        f"{i}. [{payload['chapter_title']}]\n"
+        f"   Event: {payload['event_summary']}\n"
+        f"   Emotion: {payload['emotion_tone']}\n"
+        + (f"   Key dialogue: {payload['key_dialogues'][0]}\n" if payload.get('key_dialogues') else "")
+        + "\n"
+        for i, payload in enumerate(scenes, 1)
+    ))
 
 
 def example_get_character_timeline():
@@ -179,41 +210,17 @@ def example_get_character_timeline():
     print("Example 5: Character Timeline")
     print("=" * 60)
 
-    config = load_config()
-    client = QdrantClient(path=config['paths']['vector_db_path'])
-    collection_name = config['vector_db']['collection_name']
-
-    character = "林风"
-
-    # Get all scenes with this character, ordered by chapter and scene
-    results = client.scroll(
-        collection_name=collection_name,
-        scroll_filter={
-            "must": [
-                {
-                    "key": "characters",
-                    "match": {"any": [character]}
-                }
-            ]
-        },
-        limit=100,
-        with_payload=True,
-        with_vectors=False
-    )
-
-    # Sort by chapter and scene index
-    scenes = sorted(
-        results[0],
-        key=lambda x: (x.payload['chapter'], x.payload['scene_index'])
-    )
+    character = DEMO_CHARACTER
+    scenes = character_scenes(character)
 
     print(f"\n{character}'s Timeline ({len(scenes)} scenes):\n")
 
-    for i, point in enumerate(scenes, 1):
-        payload = point.payload
-        print(f"{i}. [{payload['chapter_title']}] Scene {payload['scene_index']}")
-        print(f"   {payload['event_summary']}")
-        print()
+    # Up to 100 entries: format the whole listing, then write it in one call.
+    sys.stdout.write("".join(
+        f"{i}. [{payload['chapter_title']}] Scene {payload['scene_index']}\n"
+        f"   {payload['event_summary']}\n\n"
+        for i, payload in enumerate(scenes, 1)
+    ))
 
 
 def example_get_statistics():
@@ -222,8 +229,8 @@ def example_get_statistics():
     print("Example 6: Database Statistics")
     print("=" * 60)
 
-    config = load_config()
-    client = QdrantClient(path=config['paths']['vector_db_path'])
+    config = get_config()
+    client = get_client()
     collection_name = config['vector_db']['collection_name']
 
     # Get collection info
@@ -234,34 +241,25 @@ def example_get_statistics():
     print(f"Vector dimensions: {collection_info.config.params.vectors.size}")
     print(f"Distance metric: {collection_info.config.params.vectors.distance}")
 
-    # Sample some scenes to get statistics
-    results = client.scroll(
-        collection_name=collection_name,
-        limit=100,
-        with_payload=True,
-        with_vectors=False
-    )
-
-    # Count characters
-    all_characters = set()
-    all_locations = set()
-    significance_counts = {'high': 0, 'medium': 0, 'low': 0}
+    # Walk every scene, fetching only the fields counted below
+    char_counter = Counter()
+    loc_counter = Counter()
+    sig_counter = Counter()
 
-    for point in results[0]:
-        payload = point.payload
-        all_characters.update(payload.get('characters', []))
-        all_locations.add(payload.get('location', ''))
-        sig = payload.get('plot_significance', 'medium')
-        significance_counts[sig] += 1
+    for payload in _iter_scroll(client, collection_name, ["characters", "location", "plot_significance"]):
+        char_counter.update(payload.get('characters', []))
+        loc_counter[payload.get('location', '')] += 1
+        sig_counter[payload.get('plot_significance', 'medium')] += 1
 
-    print(f"\nUnique characters: {len(all_characters)}")
-    print(f"Unique locations: {len(all_locations)}")
+    print(f"\nUnique characters: {len(char_counter)}")
+    print(f"Unique locations: {len(loc_counter)}")
     print(f"\nPlot significance distribution:")
-    print(f"  High: {significance_counts['high']}")
-    print(f"  Medium: {significance_counts['medium']}")
-    print(f"  Low: {significance_counts['low']}")
+    print(f"  High: {sig_counter['high']}")
+    print(f"  Medium: {sig_counter['medium']}")
+    print(f"  Low: {sig_counter['low']}")
 
-    print(f"\nTop characters: {', '.join(list(all_characters)[:10])}")
+    top_characters = [name for name, _ in char_counter.most_common(10)]
+    print(f"\nTop characters: {', '.join(top_characters)}")
 
 
 def main():
@@ -273,7 +271,7 @@ def main():
 
     try:
         # Check if database exists
-        config = load_config()
+        config = get_config()
         db_path = config['paths']['vector_db_path']
 
         import os
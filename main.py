@@ -2,12 +2,19 @@
 import os
 import sys
 import json
-import yaml
 import time
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from utils.config_loader import load_yaml_config
+
 
 PLACEHOLDER_API_KEYS = {
     "sk-xxxxx",
@@ -44,9 +51,7 @@ def setup_logging(config):
 
 def load_config(config_file='config.yaml'):
     """Load configuration from YAML file."""
-    with open(config_file, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
-    return config
+    return load_yaml_config(config_file)
 
 
 def print_banner():
@@ -58,6 +63,18 @@ def print_banner():
     print()
 
 
+def _summarize_scenes_file(scenes_file):
+    """Return (total_scenes, coverage_rate, char_count) for a scenes file, or None if missing."""
+    try:
+        with open(scenes_file, 'rb') as f:
+            raw = f.read()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    char_count = sum(scene.get('char_count', 0) for scene in data['scenes'])
+    return data['total_scenes'], data['coverage_rate'], char_count
+
+
 def print_report(config, start_time):
     """Print processing report."""
     # Load chapter index
@@ -82,27 +99,32 @@ def print_report(config, start_time):
         if 'failed' in ch.get('status', '')
     ]
 
-    # Load scenes data
+    # Scene totals: step 2 records them on each index entry; only indexes written
+    # before that need the per-chapter scenes files (read concurrently).
     total_scenes = 0
     total_chars = 0
     coverages = []
 
     scenes_dir = config['paths']['scenes_dir']
+    scenes_files = []
     for chapter in index_data['chapters']:
-        scenes_relpath = chapter.get('scenes_file')
-        if not scenes_relpath:
+        if not chapter.get('scenes_file'):
             continue
-
-        scenes_file = os.path.join(scenes_dir, scenes_relpath)
-
-        if os.path.isfile(scenes_file):
-            with open(scenes_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                total_scenes += data['total_scenes']
-                coverages.append(data['coverage_rate'])
-
-                for scene in data['scenes']:
-                    total_chars += scene.get('char_count', 0)
+        if 'scene_count' in chapter:
+            total_scenes += chapter['scene_count']
+            coverages.append(chapter['coverage_rate'])
+            total_chars += chapter['scene_chars']
+        else:
+            scenes_files.append(os.path.join(scenes_dir, chapter['scenes_file']))
+    if scenes_files:
+        with ThreadPoolExecutor(max_workers=min(32, len(scenes_files))) as executor:
+            for summary in executor.map(_summarize_scenes_file, scenes_files):
+                if summary is None:
+                    continue
+                scene_count, coverage, char_count = summary
+                total_scenes += scene_count
+                coverages.append(coverage)
+                total_chars += char_count
 
     avg_scenes = total_scenes / total_chapters if total_chapters > 0 else 0
     avg_length = total_chars / total_scenes if total_scenes > 0 else 0
@@ -22,14 +22,15 @@ import argparse
 import json
 import os
 import shutil
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
-import yaml
-
 from services.auth_service import AuthService, normalize_username
 from services.db import Database, utc_now
 from services.storage_layout import StorageLayout
+from utils.config_loader import load_yaml_config
 
 
 def _derive_data_root(config: Dict[str, Any]) -> str:
@@ -51,7 +52,10 @@ def _ensure_dir(path: str) -> None:
 
 
 def _copy_or_move(src: str, dst: str, move: bool) -> None:
-    if not os.path.exists(src):
+    # One stat answers both "does it exist" and "is it a directory".
+    try:
+        src_stat = os.stat(src)
+    except FileNotFoundError:
         return
     _ensure_dir(os.path.dirname(dst))
     if os.path.exists(dst):
@@ -60,7 +64,7 @@ def _copy_or_move(src: str, dst: str, move: bool) -> None:
     if move:
         shutil.move(src, dst)
     else:
-        if os.path.isdir(src):
+        if stat.S_ISDIR(src_stat.st_mode):
             shutil.copytree(src, dst)
         else:
             shutil.copy2(src, dst)
@@ -88,10 +92,15 @@ def main() -> int:
     parser.add_argument("--visibility", default="private", choices=["private", "public"], help="Visibility for migrated novels")
     parser.add_argument("--move", action="store_true", help="Move directories instead of copying")
     parser.add_argument("--dry-run", action="store_true", help="Print actions without changing disk/DB")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=min(8, (os.cpu_count() or 1) * 2),
+        help="Concurrent directory copies (--move always runs serially)",
+    )
     args = parser.parse_args()
 
-    with open(args.config, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f) or {}
+    config = load_yaml_config(args.config) or {}
 
     data_root = _derive_data_root(config)
     vector_db_root = str(config.get("paths", {}).get("vector_db_path") or "vector_db")
@@ -120,17 +129,24 @@ def main() -> int:
     migrated = 0
     skipped = 0
 
+    # One query for the existing ids and one transaction for all inserts, instead of
+    # a lookup plus an autocommitted INSERT per novel.
+    existing = set()
+    if not args.dry_run:
+        existing = {str(row["id"]) for row in db.query_all("SELECT id FROM novels;")}
+    rows: List[Tuple[Any, ...]] = []
+    migrated_ids: List[str] = []
+
     for item in novels:
         novel_id = str(item.get("novel_id", "") or "").strip()
         if not novel_id:
             continue
 
         # Skip if already exists.
-        if not args.dry_run:
-            exists = db.query_one("SELECT id FROM novels WHERE id = ?;", (novel_id,))
-            if exists:
-                skipped += 1
-                continue
+        if novel_id in existing:
+            skipped += 1
+            continue
+        existing.add(novel_id)
 
         title = str(item.get("title", "") or "")
         status = str(item.get("status", "created") or "created")
@@ -143,42 +159,55 @@ def main() -> int:
 
         print(f"[migrate] novel {novel_id} -> user {username} ({user_id})", file=sys.stderr)
 
-        if not args.dry_run:
-            db.execute(
+        rows.append(
+            (
+                novel_id,
+                user_id,
+                title,
+                args.visibility,
+                status,
+                created_at,
+                updated_at,
+                json.dumps(source_meta, ensure_ascii=False),
+                json.dumps(stats, ensure_ascii=False),
+                last_job_id,
+                last_error,
+            )
+        )
+        migrated_ids.append(novel_id)
+        migrated += 1
+
+    if not args.dry_run:
+        if rows:
+            db.execute_many(
                 """
                 INSERT INTO novels (id, owner_user_id, title, visibility, status, created_at, updated_at, source_meta, stats, last_job_id, last_error)
                 VALUES (?,?,?,?,?,?,?,?,?,?,?);
                 """,
-                (
-                    novel_id,
-                    user_id,
-                    title,
-                    args.visibility,
-                    status,
-                    created_at,
-                    updated_at,
-                    json.dumps(source_meta, ensure_ascii=False),
-                    json.dumps(stats, ensure_ascii=False),
-                    last_job_id,
-                    last_error,
-                ),
+                rows,
             )
-            layout.ensure_novel_dirs(user_id, novel_id)
 
         # Copy/move workspace + vdb + logs.
-        old_workspace = os.path.join(data_root, "novels", novel_id)
-        new_workspace = os.path.join(layout.user_root(user_id), "novels", novel_id)
-        old_vdb = os.path.join(vector_db_root, novel_id)
-        new_vdb = os.path.join(vector_db_root, "users", user_id, novel_id)
-        old_logs = os.path.join(logs_root, "novels", novel_id)
-        new_logs = os.path.join(logs_root, "users", user_id, "novels", novel_id)
-
-        if not args.dry_run:
-            _copy_or_move(old_workspace, new_workspace, move=bool(args.move))
-            _copy_or_move(old_vdb, new_vdb, move=bool(args.move))
-            _copy_or_move(old_logs, new_logs, move=bool(args.move))
-
-        migrated += 1
+        transfers: List[Tuple[str, str]] = []
+        for novel_id in migrated_ids:
+            transfers.append((os.path.join(data_root, "novels", novel_id), os.path.join(layout.user_root(user_id), "novels", novel_id)))
+            transfers.append((os.path.join(vector_db_root, novel_id), os.path.join(vector_db_root, "users", user_id, novel_id)))
+            transfers.append((os.path.join(logs_root, "novels", novel_id), os.path.join(logs_root, "users", user_id, "novels", novel_id)))
+
+        if args.move or args.jobs <= 1:
+            # Moves are renames on the same filesystem; nothing to gain from threads.
+            for src, dst in transfers:
+                _copy_or_move(src, dst, move=bool(args.move))
+        else:
+            # Copies are I/O bound (shutil uses sendfile on Linux), so threads keep
+            # several trees in flight at once.
+            with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+                list(executor.map(lambda pair: _copy_or_move(pair[0], pair[1], move=False), transfers))
+
+        for novel_id in migrated_ids:
+            # After the copy: _copy_or_move skips targets that already exist, so
+            # creating the layout first would leave the legacy data behind.
+            layout.ensure_novel_dirs(user_id, novel_id)
 
     print(f"[migrate] done: migrated={migrated} skipped={skipped} move={args.move} dry_run={args.dry_run}", file=sys.stderr)
     return 0
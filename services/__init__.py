@@ -1,16 +1,36 @@
 """RP query service package."""
 
-from .guardrails import Guardrails
-from .query_understanding import QueryUnderstandingService
-from .retrieval_orchestrator import RetrievalOrchestrator
-from .session_state import SessionState, SessionStateStore
-from .worldbook_builder import WorldbookBuilder
-
 __all__ = [
     "Guardrails",
     "QueryUnderstandingService",
+    "RedisSessionStateStore",
     "RetrievalOrchestrator",
     "SessionState",
+    "SessionStateCache",
     "SessionStateStore",
+    "SessionWriteBuffer",
     "WorldbookBuilder",
 ]
+
+# Resolve exports lazily: importing a light submodule such as `services.db` must
+# not drag in the retrieval stack (qdrant_client, openai) via this package.
+_EXPORTS = {
+    "Guardrails": ".guardrails",
+    "QueryUnderstandingService": ".query_understanding",
+    "RedisSessionStateStore": ".session_state",
+    "RetrievalOrchestrator": ".retrieval_orchestrator",
+    "SessionState": ".session_state",
+    "SessionStateCache": ".session_state",
+    "SessionStateStore": ".session_state",
+    "SessionWriteBuffer": ".session_state",
+    "WorldbookBuilder": ".worldbook_builder",
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    return getattr(import_module(module_name, __name__), name)
@@ -1,6 +1,7 @@
 """Authentication and session management (cookie-based).
 
-This is an MVP implementation using stdlib PBKDF2 for password hashing.
+This is an MVP implementation using stdlib scrypt for password hashing (hashes
+created with the earlier PBKDF2 scheme still verify and are upgraded on login).
 """
 
 from __future__ import annotations
@@ -10,7 +11,10 @@ import hashlib
 import hmac
 import re
 import secrets
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional, Tuple
@@ -48,31 +52,58 @@ def _b64decode(data: str) -> bytes:
     return base64.urlsafe_b64decode(padded.encode("ascii"))
 
 
-def hash_password(password: str, iterations: int = 360_000) -> str:
+# scrypt (n=2**14, r=8): ~16 MiB of memory per hash, a fraction of the CPU time of
+# 360k PBKDF2-SHA256 rounds. Builds whose OpenSSL lacks scrypt keep using PBKDF2.
+SCRYPT_PARAMS = (2**14, 8, 1)
+PBKDF2_ITERATIONS = 360_000
+_HAS_SCRYPT = hasattr(hashlib, "scrypt")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=64 * 1024 * 1024, dklen=32
+    )
+
+
+def hash_password(password: str) -> str:
     validate_password(password)
     salt = secrets.token_bytes(16)
-    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-    return f"pbkdf2_sha256${iterations}${_b64(salt)}${_b64(dk)}"
+    if not _HAS_SCRYPT:
+        dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(dk)}"
+    n, r, p = SCRYPT_PARAMS
+    dk = _scrypt(password, salt, n, r, p)
+    return f"scrypt${n}:{r}:{p}${_b64(salt)}${_b64(dk)}"
 
 
 def verify_password(password: str, encoded: str) -> bool:
     try:
-        algo, iter_s, salt_s, hash_s = str(encoded).split("$", 3)
+        algo, params_s, salt_s, hash_s = str(encoded).split("$", 3)
     except ValueError:
         return False
-    if algo != "pbkdf2_sha256":
+    if algo not in {"scrypt", "pbkdf2_sha256"}:
         return False
     try:
-        iterations = int(iter_s)
         salt = _b64decode(salt_s)
         expected = _b64decode(hash_s)
+        if algo == "scrypt":
+            n, r, p = (int(part) for part in params_s.split(":"))
+            dk = _scrypt(str(password), salt, n, r, p)
+        else:
+            dk = hashlib.pbkdf2_hmac("sha256", str(password).encode("utf-8"), salt, int(params_s))
     except Exception:
         return False
-
-    dk = hashlib.pbkdf2_hmac("sha256", str(password).encode("utf-8"), salt, iterations)
     return hmac.compare_digest(dk, expected)
 
 
+def password_needs_rehash(encoded: str) -> bool:
+    """True when `encoded` was not produced by the current hash_password settings."""
+    if not _HAS_SCRYPT:
+        return False
+    n, r, p = SCRYPT_PARAMS
+    return not str(encoded).startswith(f"scrypt${n}:{r}:{p}$")
+
+
 def _sha256_hex(value: str) -> str:
     return hashlib.sha256(str(value or "").encode("utf-8")).hexdigest()
 
@@ -100,12 +131,25 @@ class AuthService:
         cookie_name: str = "airp_sid",
         user_session_days: int = 30,
         guest_session_days: int = 30,
+        session_cache_size: int = 4096,
+        session_cache_ttl_s: float = 30.0,
+        touch_interval_s: float = 60.0,
     ):
         self.db = db
         self.cookie_name = cookie_name
         self.user_session_days = max(1, int(user_session_days or 30))
         self.guest_session_days = max(1, int(guest_session_days or 30))
 
+        # Every request resolves its cookie; keep recent lookups in memory so the
+        # steady state skips the SQLite JOIN (and most last_seen_at writes).
+        # Revocations from other processes are seen once an entry's TTL lapses.
+        self.session_cache_size = max(0, int(session_cache_size or 0))
+        self.session_cache_ttl_s = max(0.0, float(session_cache_ttl_s or 0))
+        self.touch_interval_s = max(0.0, float(touch_interval_s or 0))
+        # token_hash -> [cached_until (monotonic), session expires_at, actor, last_touch (monotonic)]
+        self._session_cache: "OrderedDict[str, list]" = OrderedDict()
+        self._session_cache_lock = threading.Lock()
+
     def register(self, username: str, password: str) -> Dict[str, Any]:
         normalized = normalize_username(username)
         validate_username(normalized)
@@ -132,6 +176,15 @@ class AuthService:
             return None
         if not verify_password(password, row.get("password_hash", "")):
             return None
+        if password_needs_rehash(row.get("password_hash", "")):
+            # Upgrade legacy hashes while the plaintext is at hand; login still succeeds on failure.
+            try:
+                self.db.execute(
+                    "UPDATE users SET password_hash = ? WHERE id = ?;",
+                    (hash_password(password), row["id"]),
+                )
+            except Exception:
+                pass
         return {"id": row["id"], "username": row["username"], "created_at": row["created_at"]}
 
     def create_user_session(self, user_id: str) -> Tuple[str, Dict[str, Any]]:
@@ -193,6 +246,8 @@ class AuthService:
 
     def revoke_session(self, token: str) -> None:
         token_hash = _sha256_hex(token)
+        with self._session_cache_lock:
+            self._session_cache.pop(token_hash, None)
         self.db.execute(
             "UPDATE auth_sessions SET revoked_at = ? WHERE token_hash = ? AND revoked_at IS NULL;",
             (utc_now(), token_hash),
@@ -202,6 +257,32 @@ class AuthService:
         if not token:
             return None
         token_hash = _sha256_hex(token)
+        use_cache = bool(self.session_cache_size and self.session_cache_ttl_s)
+        last_touch = float("-inf")
+        if use_cache:
+            with self._session_cache_lock:
+                entry = self._session_cache.get(token_hash)
+                if entry is not None:
+                    if entry[0] > time.monotonic() and entry[1] > datetime.now(timezone.utc):
+                        self._session_cache.move_to_end(token_hash)
+                        return entry[2]
+                    last_touch = entry[3]
+                    del self._session_cache[token_hash]
+
+        actor, expires_at = self._load_actor(token_hash)
+        if actor is not None and use_cache:
+            with self._session_cache_lock:
+                self._session_cache[token_hash] = [
+                    time.monotonic() + self.session_cache_ttl_s,
+                    expires_at,
+                    actor,
+                    last_touch,
+                ]
+                while len(self._session_cache) > self.session_cache_size:
+                    self._session_cache.popitem(last=False)
+        return actor
+
+    def _load_actor(self, token_hash: str) -> Tuple[Optional[Actor], Optional[datetime]]:
         row = self.db.query_one(
             """
             SELECT s.user_id, s.guest_id, s.expires_at, s.revoked_at, u.username
@@ -212,28 +293,36 @@ class AuthService:
             (token_hash,),
         )
         if not row:
-            return None
+            return None, None
         if row.get("revoked_at"):
-            return None
+            return None, None
         try:
             expires_at = datetime.fromisoformat(str(row.get("expires_at") or ""))
         except Exception:
-            return None
+            return None, None
         if expires_at <= datetime.now(timezone.utc):
-            return None
+            return None, None
 
         user_id = row.get("user_id")
         if user_id:
-            return Actor(type="user", user_id=str(user_id), username=str(row.get("username") or ""))
+            return Actor(type="user", user_id=str(user_id), username=str(row.get("username") or "")), expires_at
         guest_id = row.get("guest_id")
         if guest_id:
-            return Actor(type="guest", guest_id=str(guest_id))
-        return None
+            return Actor(type="guest", guest_id=str(guest_id)), expires_at
+        return None, None
 
     def touch_session(self, token: Optional[str]) -> None:
         if not token:
             return
         token_hash = _sha256_hex(token)
+        if self.touch_interval_s:
+            now = time.monotonic()
+            with self._session_cache_lock:
+                entry = self._session_cache.get(token_hash)
+                if entry is not None:
+                    if now - entry[3] < self.touch_interval_s:
+                        return
+                    entry[3] = now
         try:
             self.db.execute(
                 "UPDATE auth_sessions SET last_seen_at = ? WHERE token_hash = ?;",
@@ -7,8 +7,9 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
@@ -17,9 +18,29 @@ def utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
 @dataclass(frozen=True)
 class Database:
     path: str
+    # PRAGMA synchronous for every connection: FULL fsyncs each commit, NORMAL
+    # skips that in WAL mode (a crash may lose the last commits, never corrupts
+    # the file).
+    synchronous: str = "FULL"
+    # Each thread keeps one open connection instead of reconnecting per query.
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False, compare=False)
+    # The same connections by owning thread, so close() can reach all of them.
+    _conns: Dict[threading.Thread, sqlite3.Connection] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _conns_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        synchronous = str(self.synchronous).upper()
+        if synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {', '.join(_SYNCHRONOUS_MODES)}")
+        object.__setattr__(self, "synchronous", synchronous)
 
     def connect(self) -> sqlite3.Connection:
         os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
@@ -27,21 +48,44 @@ class Database:
         conn.row_factory = sqlite3.Row
         try:
             conn.execute("PRAGMA foreign_keys = ON;")
+            # WAL lets readers proceed during writes.
+            conn.execute("PRAGMA journal_mode = WAL;")
+            conn.execute(f"PRAGMA synchronous = {self.synchronous};")
         except Exception:
             pass
         return conn
 
+    def _thread_conn(self) -> sqlite3.Connection:
+        thread = threading.current_thread()
+        conn = getattr(self._local, "conn", None)
+        # close() empties the registry; a thread's cached connection is then stale.
+        if conn is not None and self._conns.get(thread) is conn:
+            return conn
+        conn = self.connect()
+        with self._conns_lock:
+            for dead in [t for t in self._conns if not t.is_alive()]:
+                self._conns.pop(dead).close()
+            self._conns[thread] = conn
+        self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close every thread's connection; later queries open new ones."""
+        with self._conns_lock:
+            conns = list(self._conns.values())
+            self._conns.clear()
+        for conn in conns:
+            conn.close()
+
     @contextmanager
     def conn(self) -> Iterator[sqlite3.Connection]:
-        conn = self.connect()
+        conn = self._thread_conn()
         try:
             yield conn
             conn.commit()
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        except BaseException:
+            conn.rollback()
+            raise
 
     def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
         with self.conn() as conn:
@@ -1,10 +1,25 @@
 """Guardrail utilities for spoiler and hallucination control."""
+import json
 from typing import Dict, List, Optional
 
 from .helpers import parse_chapter_no
 from .models import QueryUnderstandingResult, RetrievalCandidate
 
 
+# Static prompt: built once at import instead of on every respond() call.
+GROUNDING_SYSTEM_PROMPT = (
+    "你是角色扮演剧情助手。\n"
+    "规则：\n"
+    "1) 只能基于给定 worldbook_context 里的 facts 和 character_state 回答。\n"
+    "2) 不得编造未在证据中出现的事实。\n"
+    "3) 重要断言必须引用来源。\n"
+    "4) 若证据不足，直接说明证据不足，并提出需要补充的信息。"
+)
+
+_GROUNDING_PROMPT_HEADER = "以下是检索到的 worldbook_context（JSON）：\n"
+_GROUNDING_PROMPT_INSTRUCTION = "\n\n请根据以上信息回复玩家，并在末尾附上 citations 数组中的关键来源。\n玩家消息："
+
+
 class Guardrails:
     """Apply spoiler filtering and response constraints."""
 
@@ -34,7 +49,8 @@ class Guardrails:
         return filtered
 
     def has_enough_evidence(self, citations: List[Dict]) -> bool:
-        return len(citations or []) > 0
+        # Presence check only: citations carry no scores to threshold on.
+        return bool(citations)
 
     def build_insufficient_evidence_reply(self, query: QueryUnderstandingResult) -> str:
         if query.intent == "next_action":
@@ -43,27 +59,22 @@ class Guardrails:
 
     def build_grounding_system_prompt(self) -> str:
         """System prompt that enforces citation-grounded response behavior."""
-        return (
-            "你是角色扮演剧情助手。\n"
-            "规则：\n"
-            "1) 只能基于给定 worldbook_context 里的 facts 和 character_state 回答。\n"
-            "2) 不得编造未在证据中出现的事实。\n"
-            "3) 重要断言必须引用来源。\n"
-            "4) 若证据不足，直接说明证据不足，并提出需要补充的信息。"
-        )
+        return GROUNDING_SYSTEM_PROMPT
 
     def compose_grounding_prompt(self, user_message: str, worldbook_context: Dict) -> str:
-        """Compose user prompt for final response generation."""
-        return (
-            "以下是检索到的 worldbook_context（JSON）：\n"
-            f"{worldbook_context}\n\n"
-            "请根据以上信息回复玩家，并在末尾附上 citations 数组中的关键来源。\n"
-            f"玩家消息：{user_message}"
+        """Compose user prompt for final response generation.
+
+        Static text and the worldbook come before the per-turn message so the
+        prompt keeps a byte-stable prefix that providers can prefix-cache.
+        """
+        context_json = json.dumps(worldbook_context, ensure_ascii=False, default=str)
+        return "".join(
+            (_GROUNDING_PROMPT_HEADER, context_json, _GROUNDING_PROMPT_INSTRUCTION, user_message)
         )
 
     def append_citation_footer(self, reply: str, citations: List[Dict]) -> str:
         """Attach compact citation footer if model reply forgot to mention sources."""
-        if not citations:
+        if not citations or "参考来源" in reply or "citation" in reply.lower():
             return reply
 
         lines = []
@@ -75,7 +86,4 @@ class Guardrails:
             else:
                 lines.append(f"- {chapter} / scene {scene}")
 
-        footer = "\n\n参考来源:\n" + "\n".join(lines)
-        if "参考来源" in reply or "citation" in reply.lower():
-            return reply
-        return reply + footer
+        return "\n".join([reply, "", "参考来源:", *lines])
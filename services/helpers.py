@@ -3,12 +3,18 @@ import re
 from typing import Iterable, List, Optional
 
 
-STOP_WORDS = {
+STOP_WORDS = frozenset({
     "的", "了", "是", "在", "我", "你", "他", "她", "它", "我们", "你们", "他们",
     "她们", "它们", "和", "与", "及", "或", "并", "就", "都", "也", "很", "还", "吗",
     "呢", "啊", "吧", "么", "如何", "怎么", "什么", "哪个", "哪些", "这个", "那个", "这里",
     "那里", "一下", "一下子", "请", "帮", "一下", "继续", "现在", "之前", "之后",
-}
+})
+
+_CHAPTER_NO_RE = re.compile(r"(\d+)")
+
+# Chinese runs (group 1) or ASCII words (group 2); the classes are disjoint, so one
+# scan finds the same chunks as two separate findall passes.
+_KEYWORD_RE = re.compile(r"([\u4e00-\u9fff]{2,})|([A-Za-z][A-Za-z0-9_\-]{1,})")
 
 
 def parse_chapter_no(chapter_value) -> Optional[int]:
@@ -19,11 +25,11 @@ def parse_chapter_no(chapter_value) -> Optional[int]:
     if isinstance(chapter_value, int):
         return chapter_value
 
-    text = str(chapter_value)
+    text = chapter_value if isinstance(chapter_value, str) else str(chapter_value)
     if text.isdigit():
         return int(text)
 
-    matched = re.search(r"(\d+)", text)
+    matched = _CHAPTER_NO_RE.search(text)
     if not matched:
         return None
 
@@ -46,29 +52,17 @@ def tokenize_keywords(text: str) -> List[str]:
     if not text:
         return []
 
-    tokens = []
-
-    # Chinese chunks
-    for chunk in re.findall(r"[\u4e00-\u9fff]{2,}", text):
-        if chunk not in STOP_WORDS:
-            tokens.append(chunk)
-
-    # ASCII words
-    for chunk in re.findall(r"[A-Za-z][A-Za-z0-9_\-]{1,}", text):
-        lowered = chunk.lower()
-        if lowered not in STOP_WORDS:
-            tokens.append(lowered)
+    # Chinese chunks first, then ASCII words (lowercased)
+    chinese = []
+    ascii_words = []
+    for chinese_chunk, ascii_chunk in _KEYWORD_RE.findall(text):
+        if chinese_chunk:
+            chinese.append(chinese_chunk)
+        else:
+            ascii_words.append(ascii_chunk.lower())
 
     # Deduplicate while preserving order
-    seen = set()
-    deduped = []
-    for token in tokens:
-        if token in seen:
-            continue
-        seen.add(token)
-        deduped.append(token)
-
-    return deduped
+    return [token for token in dict.fromkeys(chinese + ascii_words) if token not in STOP_WORDS]
 
 
 def normalize_entities(values: Iterable[str]) -> List[str]:
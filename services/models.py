@@ -11,6 +11,13 @@ class QueryConstraints:
     active_characters: List[str] = field(default_factory=list)
     location_hints: List[str] = field(default_factory=list)
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "unlocked_chapter": self.unlocked_chapter,
+            "active_characters": list(self.active_characters),
+            "location_hints": list(self.location_hints),
+        }
+
 
 @dataclass
 class QueryUnderstandingResult:
@@ -24,8 +31,15 @@ class QueryUnderstandingResult:
     constraints: QueryConstraints = field(default_factory=QueryConstraints)
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        return data
+        # Fixed shape, built directly: asdict() walks fields and deep-copies recursively.
+        return {
+            "intent": self.intent,
+            "normalized_query": self.normalized_query,
+            "entities": list(self.entities),
+            "locations": list(self.locations),
+            "event_keywords": list(self.event_keywords),
+            "constraints": self.constraints.to_dict(),
+        }
 
 
 @dataclass
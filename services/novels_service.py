@@ -121,14 +121,23 @@ class NovelsService:
         return [self._row_to_record(row).to_entry_dict() for row in rows]
 
     def list_public(self) -> List[Dict[str, Any]]:
+        # Only the to_public_dict() columns: no source/stats JSON to fetch or parse.
         rows = self.db.query_all(
             """
-            SELECT * FROM novels
+            SELECT id, title, status, updated_at FROM novels
             WHERE visibility = 'public' AND status != 'deleted'
             ORDER BY updated_at DESC;
             """
         )
-        return [self._row_to_record(row).to_public_dict() for row in rows]
+        return [
+            {
+                "novel_id": str(row["id"]),
+                "title": str(row["title"]),
+                "status": str(row["status"]),
+                "updated_at": str(row["updated_at"]),
+            }
+            for row in rows
+        ]
 
     def create(self, owner_user_id: str, title: str = "") -> Dict[str, Any]:
         owner_user_id = str(owner_user_id or "").strip()
@@ -185,7 +194,10 @@ class NovelsService:
         return record.visibility == "public"
 
     def paths(self, novel_id: str) -> Dict[str, str]:
-        record = self.get(novel_id)
+        return self.record_paths(self.get(novel_id))
+
+    def record_paths(self, record: NovelRecord) -> Dict[str, str]:
+        """Workspace paths for an already-fetched record (no extra DB lookup)."""
         return self.layout.user_novel_paths(record.owner_user_id, record.novel_id)
 
     def update(self, owner_user_id: str, novel_id: str, *, title: Optional[str] = None, visibility: Optional[str] = None) -> Dict[str, Any]:
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import json
 import os
+import secrets
 import threading
-import uuid
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, Optional
@@ -176,7 +176,7 @@ class PipelineJobsService:
                     raise RuntimeError("another pipeline job is already running")
                 self._running_job_id = None
 
-            allocated_job_id = str(job_id or "").strip() or uuid.uuid4().hex
+            allocated_job_id = str(job_id or "").strip() or secrets.token_hex(16)
             job = PipelineJob(
                 job_id=allocated_job_id,
                 novel_id=novel_id,
@@ -0,0 +1,53 @@
+"""In-process TTL caches for grounded LLM replies and retrieval contexts."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class ResponseCache:
+    """Thread-safe LRU (with TTL) of LLM replies keyed by the exact prompt.
+
+    The grounding prompt is built only from the player message and the worldbook
+    context, so an identical prompt can reuse a previous reply across sessions.
+    RPQueryService also uses an instance for recent query_context results; cached
+    values are shared, so callers must treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl_s: float = 600.0):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl_s = float(ttl_s)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(system_prompt: str, prompt: str, temperature: float) -> str:
+        digest = hashlib.sha256()
+        for part in (str(system_prompt), str(prompt), repr(float(temperature))):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, reply = entry
+            if self.ttl_s > 0 and time.monotonic() - stored_at > self.ttl_s:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return reply
+
+    def put(self, key: str, reply: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), reply)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,6 +1,8 @@
 """Orchestrate multi-channel retrieval and reranking."""
 import logging
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
 from .guardrails import Guardrails
@@ -42,6 +44,11 @@ class RetrievalOrchestrator:
         self.vector_top_k = int(rp_cfg.get("vector_top_k", 30))
         self.filter_top_k = int(rp_cfg.get("filter_top_k", 20))
         self.profile_top_k = int(rp_cfg.get("profile_top_k", 10))
+        # Runs the (I/O-bound) query embedding calls; started on first use and
+        # shut down by close().
+        self.embedding_workers = max(1, int(rp_cfg.get("embedding_workers", 4)))
+        self._embedding_executor: Optional[ThreadPoolExecutor] = None
+        self._embedding_executor_lock = threading.Lock()
 
     def retrieve(
         self,
@@ -54,20 +61,9 @@ class RetrievalOrchestrator:
 
         errors: Dict[str, str] = {}
 
-        vector_start = time.perf_counter()
-        try:
-            vector_candidates = self.vector_retriever.query(
-                query_text=query_result.normalized_query,
-                top_k=self.vector_top_k,
-                active_characters=query_result.constraints.active_characters,
-                location_hints=query_result.locations,
-                unlocked_chapter=query_result.constraints.unlocked_chapter,
-            )
-        except Exception as exc:  # pragma: no cover - runtime resilience
-            logger.exception("Vector retrieval failed: %s", exc)
-            errors["vector"] = str(exc)
-            vector_candidates = []
-        vector_cost_ms = (time.perf_counter() - vector_start) * 1000
+        # The query embedding is a network round trip; start it first so it
+        # overlaps the filter/profile channels, then run the vector search.
+        embed_future = self._submit_query_embedding(query_result.normalized_query)
 
         filter_start = time.perf_counter()
         try:
@@ -93,6 +89,25 @@ class RetrievalOrchestrator:
             profile_candidates = []
         profile_cost_ms = (time.perf_counter() - profile_start) * 1000
 
+        vector_start = time.perf_counter()
+        try:
+            vector_kwargs = {}
+            if embed_future is not None:
+                vector_kwargs["query_vector"] = embed_future.result()
+            vector_candidates = self.vector_retriever.query(
+                query_text=query_result.normalized_query,
+                top_k=self.vector_top_k,
+                active_characters=query_result.constraints.active_characters,
+                location_hints=query_result.locations,
+                unlocked_chapter=query_result.constraints.unlocked_chapter,
+                **vector_kwargs,
+            )
+        except Exception as exc:  # pragma: no cover - runtime resilience
+            logger.exception("Vector retrieval failed: %s", exc)
+            errors["vector"] = str(exc)
+            vector_candidates = []
+        vector_cost_ms = (time.perf_counter() - vector_start) * 1000
+
         merged = self._dedupe(vector_candidates + filter_candidates + profile_candidates)
 
         spoiler_filtered = self.guardrails.filter_spoilers(
@@ -127,6 +142,29 @@ class RetrievalOrchestrator:
         }
         return ranked, debug
 
+    def _submit_query_embedding(self, query_text: str) -> Optional[Future]:
+        embed_query = getattr(self.vector_retriever, "embed_query", None)
+        if not query_text or not callable(embed_query):
+            return None
+        with self._embedding_executor_lock:
+            if self._embedding_executor is None:
+                self._embedding_executor = ThreadPoolExecutor(
+                    max_workers=self.embedding_workers,
+                    thread_name_prefix="rp-embed",
+                )
+            return self._embedding_executor.submit(embed_query, query_text)
+
+    def close(self) -> None:
+        """Release retriever resources (embedding threads, local Qdrant clients)."""
+        with self._embedding_executor_lock:
+            executor, self._embedding_executor = self._embedding_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for retriever in (self.vector_retriever, self.filter_retriever, self.profile_retriever):
+            close = getattr(retriever, "close", None)
+            if callable(close):
+                close()
+
     def _dedupe(self, items: List[RetrievalCandidate]) -> List[RetrievalCandidate]:
         bucket = {}
         for item in items:
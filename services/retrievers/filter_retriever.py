@@ -127,6 +127,15 @@ class FilterRetriever:
             )
             return []
 
+    def close(self) -> None:
+        """Release the local Qdrant client if this retriever opened it."""
+        if not self._owns_qdrant_client:
+            return
+        try:
+            self.qdrant_client.close()
+        except Exception as exc:  # pragma: no cover - defensive runtime guard
+            logger.warning("Failed to close local Qdrant client: %s", exc)
+
     @staticmethod
     def _is_collection_not_found(exc: ValueError) -> bool:
         message = str(exc).lower()
@@ -26,7 +26,7 @@ class VectorRetriever:
         self.vector_db_path = config["paths"]["vector_db_path"]
         self.qdrant_client = qdrant_client or QdrantClient(path=self.vector_db_path)
         self._owns_qdrant_client = qdrant_client is None
-        self.embedding_client = embedding_client or EmbeddingClient(config)
+        self.embedding_client = embedding_client or EmbeddingClient.shared(config)
 
     def query(
         self,
@@ -35,11 +35,13 @@ class VectorRetriever:
         active_characters: Optional[List[str]] = None,
         location_hints: Optional[List[str]] = None,
         unlocked_chapter: Optional[int] = None,
+        query_vector: Optional[List[float]] = None,
     ) -> List[RetrievalCandidate]:
         if not query_text:
             return []
 
-        query_vector = self.embedding_client.embed([query_text])[0]
+        if query_vector is None:
+            query_vector = self.embed_query(query_text)
         query_filter = self._build_filter(active_characters, location_hints)
 
         kwargs = {
@@ -153,6 +155,19 @@ class VectorRetriever:
             logger.warning("Failed to reopen local Qdrant client: %s", exc)
             return False
 
+    def embed_query(self, query_text: str) -> List[float]:
+        """Embed the query text; split out so callers can overlap it with other work."""
+        return self.embedding_client.embed_query(query_text)
+
+    def close(self) -> None:
+        """Release the local Qdrant client if this retriever opened it."""
+        if not self._owns_qdrant_client:
+            return
+        try:
+            self.qdrant_client.close()
+        except Exception as exc:  # pragma: no cover - defensive runtime guard
+            logger.warning("Failed to close local Qdrant client: %s", exc)
+
     def _build_filter(
         self,
         active_characters: Optional[List[str]],
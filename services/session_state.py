@@ -1,17 +1,58 @@
 """Session memory and persistence for RP conversations."""
+import asyncio
+import contextlib
 import json
+import logging
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from .helpers import normalize_entities
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# Turns kept on disk vs. turns fed back into prompts as history.
+MAX_STORED_TURNS = 20
+PROMPT_HISTORY_TURNS = 10
+
 
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+SESSION_FORMATS = ("json", "msgpack")
+SESSION_BACKENDS = ("file", "redis")
+
+
+def _dump_state(data: Dict[str, Any], fmt: str = "json") -> bytes:
+    if fmt == "msgpack":
+        import msgpack
+
+        return msgpack.packb(data, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _parse_state(raw: bytes, fmt: str = "json") -> Dict[str, Any]:
+    if fmt == "msgpack":
+        import msgpack
+
+        return msgpack.unpackb(raw, raw=False)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 @dataclass
 class SessionState:
     """Persistent state for one RP session."""
@@ -28,6 +69,12 @@ class SessionState:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    def recent_turns(self, limit: int = PROMPT_HISTORY_TURNS) -> List[Dict[str, Any]]:
+        """Return the newest `limit` turns, oldest first."""
+        if limit <= 0:
+            return []
+        return self.turns[-limit:]
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "SessionState":
         return cls(
@@ -42,37 +89,231 @@ class SessionState:
         )
 
 
+def _file_version(st: os.stat_result) -> Tuple[int, int, int]:
+    # Saves rename a fresh temp file into place, so each one gets a new inode even
+    # when coarse timestamps leave two writes with the same mtime.
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class SessionStateCache:
+    """Thread-safe LRU of parsed session files, validated by (inode, mtime, size).
+
+    One cache can be shared by many `SessionStateStore` instances (the API builds a
+    store per request), since entries are keyed by absolute file path.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = max(1, int(maxsize))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, path: str, version: Tuple[int, int, int]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(path)
+            return entry[1]
+
+    def put(self, path: str, version: Tuple[int, int, int], data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[path] = (version, data)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SessionLockRegistry:
+    """Per-session asyncio locks so one session's turns run one at a time.
+
+    A turn is load -> retrieve/LLM -> save; without the lock two concurrent
+    requests on the same session both save and one turn is lost. Entries are
+    reference counted and dropped once no request holds or awaits them.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, Tuple[asyncio.Lock, List[int]]] = {}
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        # Only touched from the event loop thread, so the dict needs no lock.
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = (asyncio.Lock(), [0])
+            self._locks[key] = entry
+        lock, users = entry
+        users[0] += 1
+        try:
+            async with lock:
+                yield
+        finally:
+            users[0] -= 1
+            if users[0] == 0:
+                del self._locks[key]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+# Shared by every service and the guest chat route in this process.
+SESSION_LOCKS = SessionLockRegistry()
+
+
+class SessionWriteBuffer:
+    """Write-behind buffer for file session stores.
+
+    `save` records the latest document per session file and returns; `flush`
+    writes every pending document once, so a burst of turns on one session costs
+    a single file write. Stores sharing a buffer read pending documents before
+    the file, so a process always sees its own unflushed turns. Only suitable
+    when a single process serves the session directory.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple["SessionStateStore", Dict[str, Any]]] = {}
+
+    def put(self, store: "SessionStateStore", path: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending[path] = (store, data)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._pending.get(path)
+        return entry[1] if entry is not None else None
+
+    def flush(self) -> int:
+        """Write all pending sessions; returns how many files were written.
+
+        A failed write is logged and its document stays pending for the next flush,
+        so one bad path never stops the other sessions from being persisted.
+        """
+        with self._lock:
+            batch = list(self._pending.items())
+        written = 0
+        for path, (store, data) in batch:
+            try:
+                store._write(path, data)
+            except Exception:
+                logger.exception("Failed to write session file %s; will retry", path)
+                continue
+            written += 1
+            with self._lock:
+                # Keep the entry if a newer save arrived while this one was written.
+                entry = self._pending.get(path)
+                if entry is not None and entry[1] is data:
+                    del self._pending[path]
+        return written
+
+    async def run(self, interval_s: float) -> None:
+        """Flush every `interval_s` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Session flush failed")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
 class SessionStateStore:
     """Filesystem-backed session state store."""
 
-    def __init__(self, base_dir: str = "/app/data/sessions"):
+    def __init__(
+        self,
+        base_dir: str = "/app/data/sessions",
+        cache: Optional[SessionStateCache] = None,
+        fsync: bool = False,
+        session_format: str = "json",
+        write_buffer: Optional[SessionWriteBuffer] = None,
+    ):
+        if session_format not in SESSION_FORMATS:
+            raise ValueError(f"session_format must be one of {SESSION_FORMATS}")
         self.base_dir = base_dir
-        os.makedirs(self.base_dir, exist_ok=True)
+        self.cache = cache
+        self.fsync = fsync
+        self.session_format = session_format
+        self.write_buffer = write_buffer
 
-    def _path(self, session_id: str) -> str:
+    def _path(self, session_id: str, fmt: Optional[str] = None) -> str:
         safe_id = str(session_id).replace("/", "_").replace("\\", "_")
-        return os.path.join(self.base_dir, f"{safe_id}.json")
+        return os.path.join(self.base_dir, f"{safe_id}.{fmt or self.session_format}")
+
+    def lock_key(self, session_id: str) -> str:
+        """Identity of the persisted session, for SessionLockRegistry."""
+        return self._path(session_id)
 
     def load(self, session_id: str, default_unlocked: int = 0) -> SessionState:
-        path = self._path(session_id)
-        if not os.path.exists(path):
-            return SessionState(session_id=session_id, max_unlocked_chapter=default_unlocked)
+        if self.write_buffer is not None:
+            pending = self.write_buffer.get(self._path(session_id))
+            if pending is not None:
+                return SessionState.from_dict(pending)
+        # Sessions written before switching formats are still readable as JSON;
+        # the next save rewrites them in the configured format.
+        formats = [self.session_format] if self.session_format == "json" else [self.session_format, "json"]
+        for fmt in formats:
+            path = self._path(session_id, fmt)
+            try:
+                version = _file_version(os.stat(path))
+            except FileNotFoundError:
+                continue
 
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return SessionState.from_dict(data)
+            data = self.cache.get(path, version) if self.cache is not None else None
+            if data is None:
+                with open(path, "rb") as f:
+                    data = _parse_state(f.read(), fmt)
+                if self.cache is not None:
+                    self.cache.put(path, version, data)
+            # from_dict copies the containers, so callers never mutate the cached dict.
+            return SessionState.from_dict(data)
+
+        return SessionState(session_id=session_id, max_unlocked_chapter=default_unlocked)
 
     def save(self, state: SessionState) -> None:
         state.updated_at = _utc_now()
         path = self._path(state.session_id)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(state.to_dict(), f, ensure_ascii=False, indent=2)
+        data = state.to_dict()
+        if self.write_buffer is not None:
+            self.write_buffer.put(self, path, data)
+            return
+        self._write(path, data)
+
+    def _write(self, path: str, data: Dict[str, Any]) -> None:
+        # Write a sibling temp file and rename it over the target so readers never
+        # observe a half-written session.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            f = open(tmp_path, "wb")
+        except FileNotFoundError:
+            # The directory is created on first save instead of on every request.
+            os.makedirs(self.base_dir, exist_ok=True)
+            f = open(tmp_path, "wb")
+        try:
+            with f:
+                f.write(_dump_state(data, self.session_format))
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        if self.cache is not None:
+            self.cache.put(path, _file_version(os.stat(path)), data)
 
     def append_turn(self, state: SessionState, role: str, content: str) -> None:
         state.turns.append({"role": role, "content": content, "ts": _utc_now()})
-        # Keep short memory bounded for prompt cost control.
-        if len(state.turns) > 20:
-            state.turns = state.turns[-20:]
+        # Keep short memory bounded for prompt cost control (trim in place).
+        if len(state.turns) > MAX_STORED_TURNS:
+            del state.turns[:-MAX_STORED_TURNS]
 
     def apply_runtime_updates(
         self,
@@ -93,3 +334,93 @@ class SessionStateStore:
     def remember_entities(self, state: SessionState, entities: List[str]) -> None:
         merged = normalize_entities(list(state.recent_entities) + list(entities or []))
         state.recent_entities = merged[-30:]
+
+
+_redis_clients: Dict[str, Any] = {}
+_redis_clients_lock = threading.Lock()
+
+
+def shared_redis_client(url: str) -> Any:
+    """Return one process-wide Redis client (and connection pool) per URL."""
+    with _redis_clients_lock:
+        client = _redis_clients.get(url)
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+            _redis_clients[url] = client
+        return client
+
+
+class RedisSessionStateStore(SessionStateStore):
+    """Redis-backed session state store: one key per session with a sliding TTL.
+
+    Turn/entity bookkeeping is inherited; only load/save talk to Redis. There is
+    no in-process cache because several workers may share the same keys.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        key_prefix: str = "sess",
+        ttl_s: int = 86400,
+        session_format: str = "json",
+    ):
+        if session_format not in SESSION_FORMATS:
+            raise ValueError(f"session_format must be one of {SESSION_FORMATS}")
+        self.client = client
+        self.key_prefix = key_prefix
+        self.ttl_s = int(ttl_s or 0)
+        self.session_format = session_format
+        self.cache = None
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}:{session_id}"
+
+    def lock_key(self, session_id: str) -> str:
+        return self._key(session_id)
+
+    def load(self, session_id: str, default_unlocked: int = 0) -> SessionState:
+        raw = self.client.get(self._key(session_id))
+        if raw is None:
+            return SessionState(session_id=session_id, max_unlocked_chapter=default_unlocked)
+        return SessionState.from_dict(_parse_state(raw, self.session_format))
+
+    def save(self, state: SessionState) -> None:
+        state.updated_at = _utc_now()
+        payload = _dump_state(state.to_dict(), self.session_format)
+        # SET replaces the value atomically; EX refreshes the expiry on every turn.
+        self.client.set(self._key(state.session_id), payload, ex=self.ttl_s or None)
+
+
+def build_session_store(
+    rp_cfg: Dict[str, Any],
+    base_dir: str,
+    key_scope: str,
+    cache: Optional[SessionStateCache] = None,
+    write_buffer: Optional[SessionWriteBuffer] = None,
+) -> SessionStateStore:
+    """Create the session store selected by `rp_query.session_backend`.
+
+    `base_dir` is used by the file backend and `key_scope` by the Redis backend;
+    both identify the same (owner, novel) session namespace. `write_buffer` only
+    applies to the file backend (Redis writes are already a single round trip).
+    """
+    backend = str(rp_cfg.get("session_backend", "file") or "file")
+    if backend not in SESSION_BACKENDS:
+        raise ValueError(f"session_backend must be one of {SESSION_BACKENDS}")
+    session_format = str(rp_cfg.get("session_format", "json") or "json")
+    if backend == "redis":
+        return RedisSessionStateStore(
+            shared_redis_client(str(rp_cfg.get("redis_url") or "redis://localhost:6379/0")),
+            key_prefix=f"sess:{key_scope}",
+            ttl_s=int(rp_cfg.get("session_ttl_s", 86400) or 0),
+            session_format=session_format,
+        )
+    return SessionStateStore(
+        base_dir=base_dir,
+        cache=cache,
+        fsync=bool(rp_cfg.get("session_fsync", False)),
+        session_format=session_format,
+        write_buffer=write_buffer,
+    )
@@ -20,9 +20,11 @@ class WorldbookBuilder:
         selected = candidates[: self.max_facts]
         context = WorldbookContext()
         citations: List[Dict] = []
+        scene_items: List[RetrievalCandidate] = []
 
         for item in selected:
             if item.source_type == "scene":
+                scene_items.append(item)
                 fact_text = item.event_summary or item.scene_summary or shorten_text(item.text, 140)
                 excerpt = shorten_text(item.text, 180)
                 fact = {
@@ -62,11 +64,9 @@ class WorldbookBuilder:
                     }
                 )
 
-        timeline_sorted = sorted(
-            [i for i in selected if i.source_type == "scene"],
-            key=lambda x: (x.chapter_no or 10**9, x.scene_index or 0),
-        )
-        for item in timeline_sorted[: self.max_facts]:
+        # `selected` is already capped at max_facts, so this sort is over a handful of items.
+        scene_items.sort(key=lambda x: (x.chapter_no or 10**9, x.scene_index or 0))
+        for item in scene_items:
             context.timeline_notes.append(
                 {
                     "chapter": item.chapter,
@@ -165,7 +165,7 @@ def run_step1(config, input_file=None, force=False):
 
 
 if __name__ == '__main__':
-    import yaml
+    from utils.config_loader import load_yaml_config
     import sys
 
     # Setup logging
@@ -175,8 +175,7 @@ if __name__ == '__main__':
     )
 
     # Load config
-    with open('config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config('config.yaml')
 
     # Get input file from command line or config
     input_file = sys.argv[1] if len(sys.argv) > 1 else config['paths']['input_file']
@@ -49,7 +49,7 @@ class SceneSplitter:
         Split a single chapter into scenes.
 
         Returns:
-            Path to scenes JSON file
+            Tuple of (path to scenes JSON file, summary dict for the chapter index)
         """
         logger.info(f"Processing chapter: {chapter_id} - {chapter_title}")
 
@@ -110,7 +110,13 @@ class SceneSplitter:
 
         logger.info(f"Saved {len(scenes)} scenes to {output_file}")
 
-        return output_file
+        # Kept on the chapter index entry so the report need not reopen every scenes file.
+        summary = {
+            'scene_count': len(scenes),
+            'coverage_rate': coverage,
+            'scene_chars': sum(scene['char_count'] for scene in scenes),
+        }
+        return output_file, summary
 
     def _get_scene_markers(self, text, estimated_scenes):
         """Call LLM to get scene split markers."""
@@ -445,8 +451,8 @@ def run_step2(config, force=False, redo_chapter=None):
 
     def _process_one(chapter_id, chapter_file, chapter_title):
         splitter = _get_thread_splitter()
-        scenes_file = splitter.split_chapter(chapter_file, chapter_id, chapter_title)
-        return chapter_id, os.path.basename(scenes_file)
+        scenes_file, summary = splitter.split_chapter(chapter_file, chapter_id, chapter_title)
+        return chapter_id, os.path.basename(scenes_file), summary
 
     if concurrent_requests > 1 and len(targets) > 1:
         logger.info(
@@ -462,9 +468,10 @@ def run_step2(config, force=False, redo_chapter=None):
                 cid = futures[future]
                 chapter_info = chapter_by_id[cid]
                 try:
-                    _, scenes_file = future.result()
+                    _, scenes_file, summary = future.result()
                     chapter_info['status'] = 'scenes_done'
                     chapter_info['scenes_file'] = scenes_file
+                    chapter_info.update(summary)
                     # Downstream outputs become stale after re-splitting.
                     chapter_info.pop('annotated_file', None)
                 except Exception as e:
@@ -474,9 +481,10 @@ def run_step2(config, force=False, redo_chapter=None):
         for cid, cfile, ctitle in targets:
             chapter_info = chapter_by_id[cid]
             try:
-                _, scenes_file = _process_one(cid, cfile, ctitle)
+                _, scenes_file, summary = _process_one(cid, cfile, ctitle)
                 chapter_info['status'] = 'scenes_done'
                 chapter_info['scenes_file'] = scenes_file
+                chapter_info.update(summary)
                 # Downstream outputs become stale after re-splitting.
                 chapter_info.pop('annotated_file', None)
             except Exception as e:
@@ -491,14 +499,13 @@ def run_step2(config, force=False, redo_chapter=None):
 
 
 if __name__ == '__main__':
-    import yaml
+    from utils.config_loader import load_yaml_config
 
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    with open('config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config('config.yaml')
 
     run_step2(config, force=True)
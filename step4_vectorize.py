@@ -121,6 +121,13 @@ class SceneVectorizer:
             field_schema=PayloadSchemaType.INTEGER
         )
 
+        # Scene order within a chapter, for ordered timeline reads.
+        self._safe_create_payload_index(
+            collection_name=self.collection_name,
+            field_name="scene_index",
+            field_schema=PayloadSchemaType.INTEGER
+        )
+
         # Index for plot_significance
         self._safe_create_payload_index(
             collection_name=self.collection_name,
@@ -288,7 +295,7 @@ class SceneVectorizer:
 
     def _extract_chapter_no(self, chapter_id):
         """Extract numeric chapter index from chapter id."""
-        matched = re.search(r'(\\d+)', str(chapter_id))
+        matched = re.search(r'(\d+)', str(chapter_id))
         if not matched:
             return 0
         try:
@@ -407,14 +414,13 @@ def run_step4(config, force=False):
 
 
 if __name__ == '__main__':
-    import yaml
+    from utils.config_loader import load_yaml_config
 
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    with open('config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config('config.yaml')
 
     run_step4(config, force=True)
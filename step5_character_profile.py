@@ -261,14 +261,13 @@ def run_step5(config):
 
 
 if __name__ == '__main__':
-    import yaml
+    from utils.config_loader import load_yaml_config
 
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
-    with open('config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config('config.yaml')
 
     run_step5(config)
@@ -1,6 +1,5 @@
 """Quick test script to verify the pipeline works."""
 import os
-import yaml
 
 
 def check_dependencies():
@@ -49,8 +48,9 @@ def check_config():
         print("  ✗ config.yaml not found")
         return False
 
-    with open('config.yaml', 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    from utils.config_loader import load_yaml_config
+
+    config = load_yaml_config('config.yaml')
 
     # Check LLM config
     llm_key = config.get('llm', {}).get('api_key', '')
@@ -0,0 +1,128 @@
+"""Tests for password hashing and session lookup caching in AuthService."""
+
+import hashlib
+import os
+import tempfile
+import unittest
+
+from tests.stubs import install_dependency_stubs
+
+install_dependency_stubs()
+
+from services.auth_service import (
+    AuthService,
+    _b64,
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
+from services.db import Database
+
+
+class _CountingDatabase(Database):
+    def __init__(self, path):
+        super().__init__(path=path)
+        object.__setattr__(self, "statements", [])
+
+    def execute(self, sql, params=()):
+        self.statements.append(" ".join(sql.split()))
+        super().execute(sql, params)
+
+    def query_one(self, sql, params=()):
+        self.statements.append(" ".join(sql.split()))
+        return super().query_one(sql, params)
+
+
+def _legacy_pbkdf2_hash(password, iterations=1000):
+    salt = b"0123456789abcdef"
+    dk = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${_b64(salt)}${_b64(dk)}"
+
+
+@unittest.skipUnless(hasattr(hashlib, "scrypt"), "hashlib.scrypt unavailable")
+class PasswordHashTests(unittest.TestCase):
+    def test_scrypt_round_trip(self):
+        encoded = hash_password("password1")
+        self.assertTrue(encoded.startswith("scrypt$"))
+        self.assertTrue(verify_password("password1", encoded))
+        self.assertFalse(verify_password("password2", encoded))
+        self.assertFalse(password_needs_rehash(encoded))
+
+    def test_legacy_pbkdf2_hash_still_verifies(self):
+        encoded = _legacy_pbkdf2_hash("password1")
+        self.assertTrue(verify_password("password1", encoded))
+        self.assertFalse(verify_password("password2", encoded))
+        self.assertTrue(password_needs_rehash(encoded))
+
+    def test_authenticate_upgrades_legacy_hash(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(path=os.path.join(tmp, "app.sqlite3"))
+            db.init_schema()
+            auth = AuthService(db=db)
+            user = auth.register("alice", "password1")
+            db.execute(
+                "UPDATE users SET password_hash = ? WHERE id = ?;",
+                (_legacy_pbkdf2_hash("password1"), user["id"]),
+            )
+
+            self.assertIsNone(auth.authenticate("alice", "password2"))
+            stored = db.query_one("SELECT password_hash FROM users WHERE id = ?;", (user["id"],))
+            self.assertTrue(stored["password_hash"].startswith("pbkdf2_sha256$"))
+
+            self.assertEqual(auth.authenticate("alice", "password1")["id"], user["id"])
+            stored = db.query_one("SELECT password_hash FROM users WHERE id = ?;", (user["id"],))
+            self.assertTrue(stored["password_hash"].startswith("scrypt$"))
+
+            self.assertEqual(auth.authenticate("alice", "password1")["id"], user["id"])
+            self.assertIsNone(auth.authenticate("alice", "password2"))
+
+
+class AuthSessionCacheTests(unittest.TestCase):
+    def _service(self, tmp, **kwargs):
+        db = _CountingDatabase(os.path.join(tmp, "app.sqlite3"))
+        db.init_schema()
+        return db, AuthService(db=db, **kwargs)
+
+    def test_repeated_lookups_and_touches_hit_the_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db, auth = self._service(tmp)
+            user = auth.register("alice", "password1")
+            token, _session = auth.create_user_session(user["id"])
+            db.statements.clear()
+
+            for _ in range(5):
+                actor = auth.actor_from_token(token)
+                auth.touch_session(token)
+
+            self.assertTrue(actor.is_user)
+            self.assertEqual(actor.username, "alice")
+            selects = [s for s in db.statements if s.startswith("SELECT")]
+            touches = [s for s in db.statements if "last_seen_at" in s]
+            self.assertEqual(len(selects), 1)
+            self.assertEqual(len(touches), 1)
+
+    def test_revoke_drops_cached_session(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _db, auth = self._service(tmp)
+            token, _session = auth.create_guest_session()
+            self.assertTrue(auth.actor_from_token(token).is_guest)
+
+            auth.revoke_session(token)
+
+            self.assertIsNone(auth.actor_from_token(token))
+
+    def test_cache_disabled_queries_every_time(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db, auth = self._service(tmp, session_cache_ttl_s=0, touch_interval_s=0)
+            token, _session = auth.create_guest_session()
+            db.statements.clear()
+
+            for _ in range(3):
+                auth.actor_from_token(token)
+                auth.touch_session(token)
+
+            self.assertEqual(len(db.statements), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the SQLite connection handling in services.db."""
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from services.db import Database
+
+
+def _synchronous(db):
+    return db.query_one("PRAGMA synchronous;")["synchronous"]
+
+
+class DatabaseTests(unittest.TestCase):
+    def test_synchronous_defaults_to_full_and_is_configurable(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            full = Database(path=os.path.join(tmp, "full.sqlite3"))
+            normal = Database(path=os.path.join(tmp, "normal.sqlite3"), synchronous="normal")
+            try:
+                self.assertEqual(_synchronous(full), 2)
+                self.assertEqual(_synchronous(normal), 1)
+            finally:
+                full.close()
+                normal.close()
+
+            with self.assertRaises(ValueError):
+                Database(path=os.path.join(tmp, "bad.sqlite3"), synchronous="FULL; DROP TABLE users")
+
+    def test_close_closes_every_thread_connection(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(path=os.path.join(tmp, "app.sqlite3"))
+            db.init_schema()
+            opened = []
+
+            def worker():
+                with db.conn() as conn:
+                    opened.append(conn)
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            with db.conn() as conn:
+                opened.append(conn)
+
+            db.close()
+            for conn in opened:
+                with self.assertRaises(sqlite3.ProgrammingError):
+                    conn.execute("SELECT 1;")
+
+            # The database stays usable; the next query reconnects.
+            self.assertEqual(db.query_one("SELECT 1 AS one;"), {"one": 1})
+            db.close()
+
+    def test_connections_of_finished_threads_are_closed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(path=os.path.join(tmp, "app.sqlite3"))
+            opened = []
+
+            def worker():
+                with db.conn() as conn:
+                    opened.append(conn)
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+            db.query_one("SELECT 1;")
+            with self.assertRaises(sqlite3.ProgrammingError):
+                opened[0].execute("SELECT 1;")
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
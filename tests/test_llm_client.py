@@ -0,0 +1,70 @@
+"""Tests for the async side of the LLM client."""
+import asyncio
+import unittest
+from unittest import mock
+
+from tests.stubs import install_dependency_stubs
+
+install_dependency_stubs()
+
+from utils.llm_client import LLMClient
+
+
+class _FakeAsyncOpenAI:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+        await self.kwargs["http_client"].aclose()
+
+
+def _config():
+    return {
+        "llm": {
+            "base_url": "http://llm.invalid/v1",
+            "api_key": "test",
+            "model": "m",
+            "annotate_model": "m",
+            "max_retries": 3,
+            "retry_delay": 0,
+        }
+    }
+
+
+class AsyncClientTests(unittest.TestCase):
+    def test_each_event_loop_gets_its_own_client(self):
+        llm = LLMClient(_config())
+
+        async def checkout():
+            first = llm._get_async_client()
+            self.assertIs(llm._get_async_client(), first)
+            await llm.aclose()
+            return first
+
+        with mock.patch("openai.AsyncOpenAI", _FakeAsyncOpenAI, create=True):
+            first = asyncio.run(checkout())
+            second = asyncio.run(checkout())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        self.assertTrue(second.closed)
+
+    def test_sdk_retries_are_disabled(self):
+        llm = LLMClient(_config())
+
+        async def checkout():
+            client = llm._get_async_client()
+            await llm.aclose()
+            return client
+
+        with mock.patch("openai.AsyncOpenAI", _FakeAsyncOpenAI, create=True):
+            client = asyncio.run(checkout())
+
+        self.assertEqual(client.kwargs["max_retries"], 0)
+        self.assertEqual(client.kwargs["timeout"], llm.request_timeout)
+
+
+if __name__ == "__main__":
+    unittest.main()
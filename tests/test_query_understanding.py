@@ -3,11 +3,13 @@ import json
 import os
 import tempfile
 import unittest
+from dataclasses import asdict
 
 from tests.stubs import install_dependency_stubs
 
 install_dependency_stubs()
 
+from services.models import QueryConstraints, QueryUnderstandingResult
 from services.query_understanding import QueryUnderstandingService
 from services.session_state import SessionState
 
@@ -67,6 +69,17 @@ class QueryUnderstandingTests(unittest.TestCase):
             self.assertIn("许七安", result.constraints.active_characters)
             self.assertTrue(result.event_keywords)
 
+    def test_to_dict_matches_dataclass_shape(self):
+        result = QueryUnderstandingResult(
+            intent="story_recap",
+            normalized_query="许七安",
+            entities=["许七安"],
+            locations=["京城"],
+            event_keywords=["破案"],
+            constraints=QueryConstraints(unlocked_chapter=3, active_characters=["许七安"]),
+        )
+        self.assertEqual(result.to_dict(), asdict(result))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -73,6 +73,20 @@ class _FailingVectorRetriever:
         raise ValueError("Collection novel_scenes not found")
 
 
+class _PrecomputedVectorRetriever(_FakeVectorRetriever):
+    def __init__(self):
+        self.embedded = []
+        self.query_vectors = []
+
+    def embed_query(self, query_text):
+        self.embedded.append(query_text)
+        return [0.1, 0.2]
+
+    def query(self, **kwargs):
+        self.query_vectors.append(kwargs.get("query_vector"))
+        return super().query(**kwargs)
+
+
 class RetrievalOrchestratorTests(unittest.TestCase):
     def test_orchestrator_dedupes_and_filters_spoilers(self):
         query = QueryUnderstandingResult(
@@ -126,6 +140,51 @@ class RetrievalOrchestratorTests(unittest.TestCase):
         self.assertEqual(debug["counts"]["vector"], 0)
         self.assertIn("vector", debug["errors"])
 
+    def test_orchestrator_embeds_query_before_vector_search(self):
+        query = QueryUnderstandingResult(
+            intent="story_recap",
+            normalized_query="许七安在县衙",
+            entities=["许七安"],
+            constraints=QueryConstraints(unlocked_chapter=10),
+        )
+        vector_retriever = _PrecomputedVectorRetriever()
+        orchestrator = RetrievalOrchestrator(
+            config={"paths": {"vector_db_path": "vector_db"}, "vector_db": {"collection_name": "novel_scenes"}},
+            vector_retriever=vector_retriever,
+            filter_retriever=_FakeFilterRetriever(),
+            profile_retriever=_FakeProfileRetriever(),
+        )
+
+        _, debug = orchestrator.retrieve(query, SessionState(session_id="s1"))
+
+        self.assertEqual(vector_retriever.embedded, ["许七安在县衙"])
+        self.assertEqual(vector_retriever.query_vectors, [[0.1, 0.2]])
+        self.assertEqual(debug["counts"]["vector"], 2)
+
+    def test_close_stops_embedding_threads(self):
+        query = QueryUnderstandingResult(
+            intent="story_recap",
+            normalized_query="许七安在县衙",
+            entities=["许七安"],
+            constraints=QueryConstraints(unlocked_chapter=10),
+        )
+        orchestrator = RetrievalOrchestrator(
+            config={"rp_query": {"embedding_workers": 2}},
+            vector_retriever=_PrecomputedVectorRetriever(),
+            filter_retriever=_FakeFilterRetriever(),
+            profile_retriever=_FakeProfileRetriever(),
+        )
+        self.assertIsNone(orchestrator._embedding_executor)
+
+        orchestrator.retrieve(query, SessionState(session_id="s1"))
+        executor = orchestrator._embedding_executor
+        self.assertEqual(executor._max_workers, 2)
+
+        orchestrator.close()
+        self.assertIsNone(orchestrator._embedding_executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(str)
+
 
 if __name__ == "__main__":
     unittest.main()
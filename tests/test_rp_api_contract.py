@@ -1,12 +1,17 @@
 """Contract tests for RPQueryService query/respond flow."""
+import asyncio
+import os
 import tempfile
+import threading
+import time
 import unittest
 
 from tests.stubs import install_dependency_stubs
 
 install_dependency_stubs()
 
-from api.rp_query_api import RPQueryService
+from api.request_models import RespondRequest
+from api.rp_query_api import MultiNovelRPQueryService, RPQueryService, _load_config_file, _parse_config_file
 from services.models import QueryConstraints, QueryUnderstandingResult, RetrievalCandidate
 from services.session_state import SessionStateStore
 
@@ -39,6 +44,15 @@ class _FakeOrchestrator:
         ], {"counts": {"ranked": 1}, "timing_ms": {"total": 1.2}}
 
 
+class _CountingOrchestrator(_FakeOrchestrator):
+    def __init__(self):
+        self.calls = 0
+
+    def retrieve(self, query_result, session_state, max_candidates=60):
+        self.calls += 1
+        return super().retrieve(query_result, session_state, max_candidates=max_candidates)
+
+
 class _FakeWorldbookBuilder:
     def build(self, candidates, query_result):
         return (
@@ -73,6 +87,36 @@ class _FakeLLMClient:
         return "基于证据，许七安已经完成破案。"
 
 
+class _CountingSessionStore(SessionStateStore):
+    def __init__(self, base_dir):
+        super().__init__(base_dir=base_dir)
+        self.loads = 0
+        self.saves = 0
+
+    def load(self, session_id, default_unlocked=0):
+        self.loads += 1
+        return super().load(session_id, default_unlocked=default_unlocked)
+
+    def save(self, state):
+        self.saves += 1
+        super().save(state)
+
+
+class _CountingLLMClient(_FakeLLMClient):
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, **kwargs):
+        self.calls += 1
+        return super().call(**kwargs)
+
+
+class _SlowAsyncLLMClient(_FakeLLMClient):
+    async def acall(self, **kwargs):
+        await asyncio.sleep(0.01)
+        return self.call(**kwargs)
+
+
 class RPApiContractTests(unittest.TestCase):
     def _base_config(self):
         return {
@@ -136,6 +180,351 @@ class RPApiContractTests(unittest.TestCase):
             self.assertEqual(session["session_id"], "session-a")
             self.assertGreaterEqual(len(session["turns"]), 2)
 
+    def test_respond_without_context_touches_session_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = _CountingSessionStore(base_dir=tmp)
+            service = RPQueryService(
+                config=self._base_config(),
+                query_understanding=_FakeQueryUnderstanding(),
+                retrieval_orchestrator=_FakeOrchestrator(),
+                worldbook_builder=_FakeWorldbookBuilder(),
+                session_store=store,
+                llm_client=_FakeLLMClient(),
+            )
+
+            resp = service.respond(message="许七安最近做了什么？", session_id="session-c", unlocked_chapter=10)
+            self.assertEqual(len(resp["citations"]), 1)
+            self.assertEqual((store.loads, store.saves), (1, 1))
+
+            session = service.get_session("session-c")
+            self.assertEqual([turn["role"] for turn in session["turns"]], ["user", "assistant"])
+            self.assertEqual(session["recent_entities"], ["许七安"])
+
+    def test_respond_after_query_context_reuses_retrieval(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            orchestrator = _CountingOrchestrator()
+            service = RPQueryService(
+                config=self._base_config(),
+                query_understanding=_FakeQueryUnderstanding(),
+                retrieval_orchestrator=orchestrator,
+                worldbook_builder=_FakeWorldbookBuilder(),
+                session_store=SessionStateStore(base_dir=tmp),
+                llm_client=_FakeLLMClient(),
+            )
+
+            context = service.query_context(message="许七安最近做了什么？", session_id="session-d", unlocked_chapter=10)
+            resp = service.respond(message="许七安最近做了什么？", session_id="session-d", unlocked_chapter=10)
+
+            self.assertEqual(orchestrator.calls, 1)
+            self.assertEqual(resp["citations"], context["citations"])
+            session = service.get_session("session-d")
+            self.assertEqual([turn["role"] for turn in session["turns"]], ["user", "assistant"])
+
+            service.respond(message="许七安最近做了什么？", session_id="session-d", unlocked_chapter=10)
+            self.assertEqual(orchestrator.calls, 2)
+
+    def test_respond_with_supplied_context_skips_retrieval(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = _CountingSessionStore(base_dir=tmp)
+            orchestrator = _CountingOrchestrator()
+            service = RPQueryService(
+                config=self._base_config(),
+                query_understanding=_FakeQueryUnderstanding(),
+                retrieval_orchestrator=orchestrator,
+                worldbook_builder=_FakeWorldbookBuilder(),
+                session_store=store,
+                llm_client=_FakeLLMClient(),
+            )
+
+            context = service.query_context(message="许七安最近做了什么？", session_id="session-d")
+            service.respond(
+                message="许七安最近做了什么？",
+                session_id="session-d",
+                worldbook_context=context["worldbook_context"],
+                citations=context["citations"],
+            )
+
+            self.assertEqual(orchestrator.calls, 1)
+            self.assertEqual((store.loads, store.saves), (2, 2))
+            session = service.get_session("session-d")
+            self.assertEqual([turn["role"] for turn in session["turns"]], ["user", "assistant"])
+
+    def test_response_cache_is_off_by_default(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            service = RPQueryService(
+                config=self._base_config(),
+                query_understanding=_FakeQueryUnderstanding(),
+                retrieval_orchestrator=_FakeOrchestrator(),
+                worldbook_builder=_FakeWorldbookBuilder(),
+                session_store=SessionStateStore(base_dir=tmp),
+                llm_client=_FakeLLMClient(),
+            )
+            self.assertIsNone(service.response_cache)
+
+    def test_identical_grounded_prompt_reuses_cached_reply(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            llm_client = _CountingLLMClient()
+            config = self._base_config()
+            config["rp_query"] = {"response_cache_size": 8}
+            service = RPQueryService(
+                config=config,
+                query_understanding=_FakeQueryUnderstanding(),
+                retrieval_orchestrator=_FakeOrchestrator(),
+                worldbook_builder=_FakeWorldbookBuilder(),
+                session_store=SessionStateStore(base_dir=tmp),
+                llm_client=llm_client,
+            )
+
+            first = service.respond(message="许七安最近做了什么？", session_id="session-e")
+            second = service.respond(message="许七安最近做了什么？", session_id="session-f")
+            asyncio.run(service.arespond(message="许七安最近做了什么？", session_id="session-g"))
+            service.respond(message="换个问题", session_id="session-e")
+
+            self.assertEqual(first["assistant_reply"], second["assistant_reply"])
+            self.assertEqual(llm_client.calls, 2)
+
+    def test_async_respond_matches_sync_contract(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            service = RPQueryService(
+                config=self._base_config(),
+                query_understanding=_FakeQueryUnderstanding(),
+                retrieval_orchestrator=_FakeOrchestrator(),
+                worldbook_builder=_FakeWorldbookBuilder(),
+                session_store=SessionStateStore(base_dir=tmp),
+                llm_client=_FakeLLMClient(),
+            )
+
+            resp = asyncio.run(service.arespond(message="许七安最近做了什么？", session_id="session-b"))
+            self.assertIn("参考来源", resp["assistant_reply"])
+            self.assertEqual(len(resp["citations"]), 1)
+
+            session = asyncio.run(service.aget_session("session-b"))
+            self.assertEqual([turn["role"] for turn in session["turns"]], ["user", "assistant"])
+
+    def test_concurrent_async_turns_on_one_session_are_not_lost(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            service = RPQueryService(
+                config=self._base_config(),
+                query_understanding=_FakeQueryUnderstanding(),
+                retrieval_orchestrator=_FakeOrchestrator(),
+                worldbook_builder=_FakeWorldbookBuilder(),
+                session_store=SessionStateStore(base_dir=tmp),
+                llm_client=_SlowAsyncLLMClient(),
+            )
+
+            async def _two_turns():
+                await asyncio.gather(
+                    service.arespond(message="第一句", session_id="session-c"),
+                    service.arespond(message="第二句", session_id="session-c"),
+                )
+
+            asyncio.run(_two_turns())
+            turns = service.get_session("session-c")["turns"]
+            self.assertEqual([turn["role"] for turn in turns], ["user", "assistant", "user", "assistant"])
+            self.assertEqual(len(service.session_locks), 0)
+
+    def test_config_file_json_sidecar_tracks_yaml_mtime(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file = os.path.join(tmp, "config.yaml")
+            with open(config_file, "w", encoding="utf-8") as f:
+                f.write("rp_query:\n  worldbook_top_n: 5\n")
+
+            config = _load_config_file(config_file)
+            self.assertEqual(config["rp_query"]["worldbook_top_n"], 5)
+            self.assertTrue(os.path.exists(config_file + ".cache.json"))
+
+            # Mutating the returned dict must not leak into later loads.
+            config["rp_query"]["worldbook_top_n"] = 99
+            self.assertEqual(_load_config_file(config_file)["rp_query"]["worldbook_top_n"], 5)
+
+            with open(config_file, "w", encoding="utf-8") as f:
+                f.write("rp_query:\n  worldbook_top_n: 7\n")
+            stat = os.stat(config_file)
+            os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertEqual(_load_config_file(config_file)["rp_query"]["worldbook_top_n"], 7)
+
+    def test_config_file_replaced_with_older_mtime_is_reparsed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file = os.path.join(tmp, "config.yaml")
+            with open(config_file, "w", encoding="utf-8") as f:
+                f.write("rp_query:\n  worldbook_top_n: 5\n")
+            self.assertEqual(_load_config_file(config_file)["rp_query"]["worldbook_top_n"], 5)
+
+            # e.g. `mv` or `rsync -t` of a file edited before the sidecar was written.
+            staged = os.path.join(tmp, "config.yaml.new")
+            with open(staged, "w", encoding="utf-8") as f:
+                f.write("rp_query:\n  worldbook_top_n: 7\n")
+            stat = os.stat(staged)
+            os.utime(staged, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+            os.replace(staged, config_file)
+            _parse_config_file.cache_clear()
+
+            self.assertEqual(_load_config_file(config_file)["rp_query"]["worldbook_top_n"], 7)
+
+    def test_config_file_json_sidecar_keeps_source_permissions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file = os.path.join(tmp, "config.yaml")
+            with open(config_file, "w", encoding="utf-8") as f:
+                f.write("llm:\n  api_key: secret\n")
+            os.chmod(config_file, 0o600)
+
+            # A sidecar left world-readable by an earlier version is replaced.
+            with open(config_file + ".cache.json", "w", encoding="utf-8") as f:
+                f.write('{"llm": {"api_key": "secret"}}')
+            os.chmod(config_file + ".cache.json", 0o644)
+            stat = os.stat(config_file)
+            os.utime(config_file + ".cache.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+            self.assertEqual(_load_config_file(config_file)["llm"]["api_key"], "secret")
+            self.assertEqual(os.stat(config_file + ".cache.json").st_mode & 0o777, 0o600)
+
+    def test_config_file_with_non_string_keys_skips_json_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file = os.path.join(tmp, "config.yaml")
+            with open(config_file, "w", encoding="utf-8") as f:
+                f.write("chapter_aliases:\n  1: prologue\n")
+
+            first = _load_config_file(config_file)
+            self.assertFalse(os.path.exists(config_file + ".cache.json"))
+            _parse_config_file.cache_clear()
+            second = _load_config_file(config_file)
+            self.assertEqual(first, second)
+            self.assertEqual(second["chapter_aliases"], {1: "prologue"})
+
+    def test_multi_novel_router_evicts_and_closes_least_recently_used(self):
+        class _ClosingService:
+            def __init__(self):
+                self.closed = False
+
+            def close(self):
+                self.closed = True
+
+        class _Router(MultiNovelRPQueryService):
+            def _build_service_for_novel(self, record):
+                return _ClosingService()
+
+        class _Novels:
+            def get(self, novel_id):
+                return novel_id
+
+        router = _Router({"rp_query": {"max_cached_novels": 2}}, novels=_Novels())
+        first = router.get_service("n1")
+        second = router.get_service("n2")
+        self.assertIs(router.get_service("n1"), first)
+
+        router.get_service("n3")
+        self.assertTrue(second.closed)
+        self.assertFalse(first.closed)
+        self.assertIsNot(router.get_service("n2"), second)
+
+        router.invalidate("n3")
+        self.assertEqual(list(router._services), ["n2"])
+
+    def test_multi_novel_router_defers_close_until_in_flight_requests_finish(self):
+        router_ref = []
+
+        class _Service:
+            def __init__(self):
+                self.closed = False
+                self.closed_during_call = None
+
+            def close(self):
+                self.closed = True
+
+            async def arespond(self, **kwargs):
+                router = router_ref[0]
+                # The novel is re-uploaded (invalidate) and evicted mid-request.
+                await asyncio.to_thread(router.invalidate, "n1")
+                await asyncio.to_thread(router.get_service, "n2")
+                self.closed_during_call = self.closed
+                return {"reply": "ok"}
+
+        class _Router(MultiNovelRPQueryService):
+            def _build_service_for_novel(self, record):
+                return _Service()
+
+        class _Novels:
+            def get(self, novel_id):
+                return novel_id
+
+        router = _Router({"rp_query": {"max_cached_novels": 1}}, novels=_Novels())
+        router_ref.append(router)
+        service = router.get_service("n1")
+
+        self.assertEqual(asyncio.run(router.arespond("n1", message="hi", session_id="s")), {"reply": "ok"})
+        self.assertFalse(service.closed_during_call)
+        self.assertTrue(service.closed)
+
+        # Evicted while leased: closed only on release.
+        leased = router._checkout("n2")
+        router.get_service("n3")
+        self.assertFalse(leased.service.closed)
+        router._release(leased)
+        self.assertTrue(leased.service.closed)
+
+    def test_multi_novel_router_cached_checkout_does_not_take_router_lock(self):
+        class _Service:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        class _Router(MultiNovelRPQueryService):
+            def _build_service_for_novel(self, record):
+                return _Service()
+
+        class _Novels:
+            def get(self, novel_id):
+                return novel_id
+
+        router = _Router({}, novels=_Novels())
+        service = router.get_service("n1")
+        leased = []
+
+        with router._lock:  # e.g. another thread publishing or evicting a novel
+            worker = threading.Thread(target=lambda: leased.append(router._checkout("n1")))
+            worker.start()
+            worker.join(timeout=2)
+            self.assertFalse(worker.is_alive())
+
+        self.assertIs(leased[0].service, service)
+        self.assertEqual(leased[0].leases, 1)
+        router._release(leased[0])
+        self.assertEqual(leased[0].leases, 0)
+
+    def test_multi_novel_router_builds_each_novel_once_under_concurrency(self):
+        builds = []
+
+        class _Router(MultiNovelRPQueryService):
+            def _build_service_for_novel(self, record):
+                builds.append(record)
+                time.sleep(0.05)
+                return object()
+
+        class _Novels:
+            def get(self, novel_id):
+                return novel_id
+
+        router = _Router({}, novels=_Novels())
+
+        async def _run():
+            await router.awarmup("n1")
+            return await asyncio.gather(*(asyncio.to_thread(router.get_service, "n2") for _ in range(8)))
+
+        services = asyncio.run(_run())
+        self.assertEqual(builds, ["n1", "n2"])
+        self.assertTrue(all(service is services[0] for service in services))
+
+
+class RequestModelTests(unittest.TestCase):
+    def test_numeric_ids_and_message_are_coerced_to_str(self):
+        payload = RespondRequest.model_validate({"message": 12, "session_id": 42, "novel_id": 7})
+        self.assertEqual((payload.message, payload.session_id, payload.novel_id), ("12", "42", "7"))
+
+    def test_non_scalar_message_is_still_rejected(self):
+        with self.assertRaises(ValueError):
+            RespondRequest.model_validate({"message": {"text": "hi"}, "session_id": "s"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,245 @@
+"""Tests for session persistence and the in-process session cache."""
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+import unittest
+
+from services.session_state import (
+    RedisSessionStateStore,
+    SessionStateCache,
+    SessionStateStore,
+    SessionWriteBuffer,
+    build_session_store,
+)
+
+try:
+    import msgpack  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+class SessionStateCacheTests(unittest.TestCase):
+    def test_cached_load_does_not_leak_unsaved_mutations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SessionStateStore(base_dir=tmp, cache=SessionStateCache(maxsize=4))
+            state = store.load("s1")
+            store.append_turn(state, role="user", content="hello")
+            store.save(state)
+
+            loaded = store.load("s1")
+            store.append_turn(loaded, role="assistant", content="unsaved")
+
+            self.assertEqual(len(store.load("s1").turns), 1)
+
+    def test_session_dir_is_created_on_first_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            base_dir = os.path.join(tmp, "sessions", "global")
+            store = SessionStateStore(base_dir=base_dir)
+            self.assertFalse(os.path.exists(base_dir))
+            self.assertEqual(store.load("s1", default_unlocked=3).max_unlocked_chapter, 3)
+
+            state = store.load("s1")
+            store.append_turn(state, role="user", content="hello")
+            store.save(state)
+
+            self.assertEqual(len(SessionStateStore(base_dir=base_dir).load("s1").turns), 1)
+
+    def test_external_write_invalidates_cache_entry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SessionStateCache(maxsize=4)
+            store = SessionStateStore(base_dir=tmp, cache=cache)
+            state = store.load("s1")
+            store.save(state)
+
+            path = os.path.join(tmp, "s1.json")
+            data = state.to_dict()
+            data["current_scene"] = "edited elsewhere"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+            # A second store sharing the cache (as the API does per request).
+            other = SessionStateStore(base_dir=tmp, cache=cache)
+            self.assertEqual(other.load("s1").current_scene, "edited elsewhere")
+
+    def test_replaced_file_with_same_mtime_invalidates_cache_entry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SessionStateCache(maxsize=4)
+            store = SessionStateStore(base_dir=tmp, cache=cache)
+            state = store.load("s1")
+            store.save(state)
+
+            # Another worker renames its own save into place within the same
+            # timestamp tick (simulated by restoring the original mtime).
+            path = os.path.join(tmp, "s1.json")
+            before = os.stat(path)
+            data = state.to_dict()
+            data["current_scene"] = "saved by another worker"
+            tmp_path = f"{path}.other.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+            os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+            self.assertEqual(os.stat(path).st_mtime_ns, before.st_mtime_ns)
+
+            self.assertEqual(store.load("s1").current_scene, "saved by another worker")
+
+    def test_cache_is_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SessionStateCache(maxsize=2)
+            store = SessionStateStore(base_dir=tmp, cache=cache)
+            for session_id in ("a", "b", "c"):
+                store.save(store.load(session_id))
+            self.assertEqual(len(cache), 2)
+
+    @unittest.skipUnless(msgpack, "msgpack not installed")
+    def test_msgpack_format_reads_legacy_json_sessions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = SessionStateStore(base_dir=tmp)
+            state = legacy.load("s1")
+            legacy.append_turn(state, role="user", content="你好")
+            legacy.save(state)
+
+            store = SessionStateStore(base_dir=tmp, session_format="msgpack")
+            loaded = store.load("s1")
+            self.assertEqual(loaded.turns[0]["content"], "你好")
+
+            store.append_turn(loaded, role="assistant", content="hi")
+            store.save(loaded)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "s1.msgpack")))
+            self.assertEqual(len(store.load("s1").turns), 2)
+
+
+
+class SessionWriteBufferTests(unittest.TestCase):
+    def test_saves_are_coalesced_until_flush(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            buffer = SessionWriteBuffer()
+            store = build_session_store({}, base_dir=tmp, key_scope="default", write_buffer=buffer)
+            for text in ("one", "two"):
+                state = store.load("s1")
+                store.append_turn(state, role="user", content=text)
+                store.save(state)
+
+            self.assertFalse(os.path.exists(os.path.join(tmp, "s1.json")))
+            self.assertEqual([t["content"] for t in store.load("s1").turns], ["one", "two"])
+
+            self.assertEqual(buffer.flush(), 1)
+            self.assertEqual(len(buffer), 0)
+            reloaded = SessionStateStore(base_dir=tmp).load("s1")
+            self.assertEqual([t["content"] for t in reloaded.turns], ["one", "two"])
+
+    def test_failed_write_stays_pending_and_later_saves_are_written(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            buffer = SessionWriteBuffer()
+            store = build_session_store({}, base_dir=tmp, key_scope="default", write_buffer=buffer)
+            real_write = store._write
+            failures = []
+
+            def flaky_write(path, data):
+                if not failures:
+                    failures.append(path)
+                    raise OSError("disk full")
+                real_write(path, data)
+
+            store._write = flaky_write
+            for session_id in ("s1", "s2"):
+                state = store.load(session_id)
+                store.append_turn(state, role="user", content=session_id)
+                store.save(state)
+
+            with self.assertLogs("services.session_state", level="ERROR"):
+                self.assertEqual(buffer.flush(), 1)
+            self.assertEqual(len(buffer), 1)
+
+            state = store.load("s3")
+            store.append_turn(state, role="user", content="s3")
+            store.save(state)
+            self.assertEqual(buffer.flush(), 2)
+            self.assertEqual(len(buffer), 0)
+
+            reader = SessionStateStore(base_dir=tmp)
+            for session_id in ("s1", "s2", "s3"):
+                self.assertEqual(reader.load(session_id).turns[0]["content"], session_id)
+            self.assertEqual(sorted(os.listdir(tmp)), ["s1.json", "s2.json", "s3.json"])
+
+    def test_run_keeps_flushing_after_a_failed_write(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            buffer = SessionWriteBuffer()
+            store = build_session_store({}, base_dir=tmp, key_scope="default", write_buffer=buffer)
+            real_write = store._write
+            calls = []
+
+            def flaky_write(path, data):
+                calls.append(path)
+                if len(calls) == 1:
+                    raise PermissionError("denied")
+                real_write(path, data)
+
+            store._write = flaky_write
+            store.save(store.load("s1"))
+
+            async def scenario():
+                task = asyncio.create_task(buffer.run(0.01))
+                try:
+                    for _ in range(200):
+                        await asyncio.sleep(0.01)
+                        if len(buffer) == 0:
+                            break
+                    state = store.load("s2")
+                    store.save(state)
+                    for _ in range(200):
+                        await asyncio.sleep(0.01)
+                        if len(buffer) == 0:
+                            break
+                finally:
+                    task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await task
+
+            with self.assertLogs("services.session_state", level="ERROR"):
+                asyncio.run(scenario())
+            self.assertEqual(len(buffer), 0)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "s1.json")))
+            self.assertTrue(os.path.exists(os.path.join(tmp, "s2.json")))
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.expiry[key] = ex
+
+
+class RedisSessionStateStoreTests(unittest.TestCase):
+    def test_round_trip_uses_scoped_key_and_ttl(self):
+        client = _FakeRedis()
+        store = RedisSessionStateStore(client, key_prefix="sess:user:u1:global", ttl_s=60)
+        self.assertEqual(store.load("s1", default_unlocked=2).max_unlocked_chapter, 2)
+
+        state = store.load("s1")
+        store.append_turn(state, role="user", content="hello")
+        store.save(state)
+
+        self.assertEqual(client.expiry, {"sess:user:u1:global:s1": 60})
+        self.assertEqual(store.load("s1").turns[0]["content"], "hello")
+
+    def test_file_backend_is_the_default(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = build_session_store({}, base_dir=tmp, key_scope="default")
+            self.assertIs(type(store), SessionStateStore)
+            with self.assertRaises(ValueError):
+                build_session_store({"session_backend": "memcached"}, base_dir=tmp, key_scope="default")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,16 @@ class GuardrailsTests(unittest.TestCase):
         reply = guardrails.build_insufficient_evidence_reply(query)
         self.assertIn("证据", reply)
 
+    def test_grounding_prompt_keeps_worldbook_prefix_stable(self):
+        guardrails = Guardrails()
+        context = {"facts": [{"fact_text": "许七安破案"}]}
+        first = guardrails.compose_grounding_prompt("他是谁？", context)
+        second = guardrails.compose_grounding_prompt("接下来呢？", context)
+
+        prefix = first[: len(first) - len("他是谁？")]
+        self.assertTrue(second.startswith(prefix))
+        self.assertIn('{"facts": [{"fact_text": "许七安破案"}]}', prefix)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -48,6 +48,12 @@ class StatusRuleTests(unittest.TestCase):
             str(uuid.uuid5(uuid.NAMESPACE_URL, 'chapter_0001:000000'))
         )
 
+    def test_step4_extract_chapter_no(self):
+        vectorizer = step4.SceneVectorizer.__new__(step4.SceneVectorizer)
+        self.assertEqual(vectorizer._extract_chapter_no('第12章'), 12)
+        self.assertEqual(vectorizer._extract_chapter_no('chapter_0007'), 7)
+        self.assertEqual(vectorizer._extract_chapter_no('序章'), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
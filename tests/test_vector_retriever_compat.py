@@ -8,6 +8,7 @@ install_dependency_stubs()
 import services.retrieval_orchestrator as retrieval_orchestrator_module
 from services.retrievers.filter_retriever import FilterRetriever
 from services.retrievers.vector_retriever import VectorRetriever
+from utils.embedding_client import EmbeddingClient
 
 
 class _FakeEmbeddingClient:
@@ -16,6 +17,9 @@ class _FakeEmbeddingClient:
             return []
         return [[0.1, 0.2, 0.3]]
 
+    def embed_query(self, text):
+        return self.embed([text])[0]
+
 
 class _FakePoint:
     def __init__(self, point_id, score, payload):
@@ -210,6 +214,24 @@ class VectorRetrieverCompatTests(unittest.TestCase):
         )
         self.assertEqual(items, [])
 
+    def test_embedding_client_reuses_vectors_for_repeated_queries(self):
+        calls = []
+
+        class _CountingEmbeddingClient(EmbeddingClient):
+            def _embed_batch(self, texts):
+                calls.append(list(texts))
+                return [[0.5, 0.25, 0.125] for _ in texts]
+
+        cfg = self._base_config()
+        cfg["embedding"]["query_cache_size"] = 1
+        client = _CountingEmbeddingClient(cfg)
+
+        self.assertEqual(client.embed_query("许七安"), [0.5, 0.25, 0.125])
+        self.assertEqual(client.embed_query("许七安"), [0.5, 0.25, 0.125])
+        client.embed_query("朱县令")
+        client.embed_query("许七安")
+        self.assertEqual(calls, [["许七安"], ["朱县令"], ["许七安"]])
+
 
 if __name__ == "__main__":
     unittest.main()
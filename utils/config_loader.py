@@ -0,0 +1,11 @@
+"""Configuration file loading."""
+import yaml
+
+# libyaml's C parser when PyYAML was built with it; same safe semantics either way.
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_yaml_config(config_file='config.yaml'):
+    """Parse a YAML config file with the fastest available safe loader."""
+    with open(config_file, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
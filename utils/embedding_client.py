@@ -1,6 +1,9 @@
 """Embedding client for OpenAI-compatible API."""
 import time
 import logging
+import threading
+from array import array
+from collections import OrderedDict
 from typing import List
 from openai import OpenAI
 
@@ -11,6 +14,23 @@ logger = logging.getLogger(__name__)
 class EmbeddingClient:
     """Client for calling Embedding API."""
     _global_stats = {}
+    _shared_clients = {}
+    _shared_clients_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, config):
+        """Return a process-wide client for this `embedding` config section.
+
+        Per-novel retrievers all embed with the same model/endpoint, so they can
+        share one client (and its HTTP connection pool).
+        """
+        key = tuple(sorted((str(k), repr(v)) for k, v in config['embedding'].items()))
+        with cls._shared_clients_lock:
+            client = cls._shared_clients.get(key)
+            if client is None:
+                client = cls(config)
+                cls._shared_clients[key] = client
+            return client
 
     def __init__(self, config):
         """Initialize Embedding client with config."""
@@ -27,6 +47,12 @@ class EmbeddingClient:
             api_key=self.api_key
         )
 
+        # Exact-text LRU for query embeddings (users repeat questions); vectors are
+        # stored as float arrays, a fraction of the size of lists of Python floats.
+        self.query_cache_size = max(0, int(config['embedding'].get('query_cache_size', 256) or 0))
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+
         # Call tracking for statistics
         self.total_texts = 0
         self.total_calls = 0
@@ -54,6 +80,25 @@ class EmbeddingClient:
 
         return all_embeddings
 
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query text, reusing the vector for a repeated query."""
+        if not self.query_cache_size:
+            return self.embed([text])[0]
+
+        with self._query_cache_lock:
+            cached = self._query_cache.get(text)
+            if cached is not None:
+                self._query_cache.move_to_end(text)
+        if cached is not None:
+            return cached.tolist()
+
+        vector = self.embed([text])[0]
+        with self._query_cache_lock:
+            self._query_cache[text] = array('d', vector)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return vector
+
     def _embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Embed a single batch with retries."""
         for attempt in range(self.max_retries):
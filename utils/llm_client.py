@@ -1,14 +1,32 @@
 """LLM client for OpenAI-compatible API."""
+import asyncio
 import time
 import json
 import logging
 import threading
+import weakref
 from openai import OpenAI
 
 
 logger = logging.getLogger(__name__)
 
 
+def _build_async_http_client():
+    """Keep-alive httpx pool for AsyncOpenAI; HTTP/2 when the `h2` extra is installed."""
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+    )
+
+
 class _SharedRateLimiter:
     """Thread-safe shared leaky-bucket limiter (start-time pacing).
 
@@ -39,10 +57,11 @@ class _SharedRateLimiter:
             if new_interval > self._interval_s:
                 self._interval_s = new_interval
 
-    def wait(self):
+    def reserve(self):
+        """Claim the next start slot and return how long the caller must wait."""
         interval = self._interval_s
         if interval <= 0:
-            return
+            return 0.0
 
         with self._lock:
             now = time.time()
@@ -52,10 +71,18 @@ class _SharedRateLimiter:
             else:
                 wait_s = 0.0
                 self._next_allowed_time = now + interval
+        return wait_s
 
+    def wait(self):
+        wait_s = self.reserve()
         if wait_s > 0:
             time.sleep(wait_s)
 
+    async def async_wait(self):
+        wait_s = self.reserve()
+        if wait_s > 0:
+            await asyncio.sleep(wait_s)
+
 
 class LLMClient:
     """Client for calling LLM API."""
@@ -63,6 +90,8 @@ class LLMClient:
     _global_call_stats_lock = threading.Lock()
     _shared_rate_limiters = {}
     _shared_rate_limiters_lock = threading.Lock()
+    _shared_clients = {}
+    _shared_clients_lock = threading.Lock()
 
     def __init__(self, config):
         """Initialize LLM client with config."""
@@ -73,11 +102,16 @@ class LLMClient:
         self.max_retries = config['llm']['max_retries']
         self.retry_delay = config['llm']['retry_delay']
         self.rate_limit = config['llm'].get('rate_limit_per_minute', 30)
+        self.request_timeout = float(config['llm'].get('request_timeout', 120) or 120)
 
         self.client = OpenAI(
             base_url=self.base_url,
             api_key=self.api_key
         )
+        # httpx pools are bound to the event loop they first ran on, so keep one
+        # async client per loop; entries go away with their loop.
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
 
         # Call tracking for statistics
         self.call_stats = {}
@@ -86,6 +120,21 @@ class LLMClient:
             rate_limit_per_minute=self.rate_limit,
         )
 
+    @classmethod
+    def shared(cls, config):
+        """Return a process-wide client for this `llm` config section.
+
+        Services built per novel (or per request) reuse one instance, and with it
+        the underlying HTTP connection pools, instead of opening their own.
+        """
+        key = tuple(sorted((str(k), repr(v)) for k, v in config['llm'].items()))
+        with cls._shared_clients_lock:
+            client = cls._shared_clients.get(key)
+            if client is None:
+                client = cls(config)
+                cls._shared_clients[key] = client
+            return client
+
     @classmethod
     def _get_shared_rate_limiter(cls, key, rate_limit_per_minute):
         with cls._shared_rate_limiters_lock:
@@ -184,6 +233,97 @@ class LLMClient:
 
         raise Exception(f"LLM call failed after {self.max_retries} retries")
 
+    def _get_async_client(self):
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                from openai import AsyncOpenAI
+
+                # acall() runs its own retry loop; SDK retries would multiply it.
+                client = AsyncOpenAI(
+                    base_url=self.base_url,
+                    api_key=self.api_key,
+                    timeout=self.request_timeout,
+                    max_retries=0,
+                    http_client=_build_async_http_client(),
+                )
+                self._async_clients[loop] = client
+            return client
+
+    async def aclose(self):
+        """Close the async client bound to the running event loop, if any."""
+        with self._async_clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    @classmethod
+    async def aclose_shared(cls):
+        """Close the running loop's async clients of every :meth:`shared` instance."""
+        with cls._shared_clients_lock:
+            clients = list(cls._shared_clients.values())
+        for client in clients:
+            await client.aclose()
+
+    async def acall(self, prompt, model=None, temperature=0.7, response_format=None, system_prompt=None):
+        """
+        Async variant of :meth:`call` for use inside event-loop handlers.
+
+        Retries, rate limiting and JSON handling mirror :meth:`call`, but the
+        request and any backoff sleeps are awaited instead of blocking a thread.
+        """
+        if model is None:
+            model = self.model
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        for attempt in range(self.max_retries):
+            try:
+                await self._rate_limiter.async_wait()
+
+                kwargs = {
+                    "model": model,
+                    "messages": messages,
+                    "temperature": temperature
+                }
+                if response_format:
+                    kwargs["response_format"] = response_format
+
+                response = await asyncio.wait_for(
+                    self._get_async_client().chat.completions.create(**kwargs),
+                    timeout=self.request_timeout,
+                )
+
+                content = response.choices[0].message.content
+
+                tokens_used = response.usage.total_tokens if hasattr(response, 'usage') else 0
+                self._track_call(model, tokens_used)
+
+                if response_format and response_format.get('type') == 'json_object':
+                    try:
+                        return json.loads(content)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Failed to parse JSON response, attempt {attempt + 1}")
+                        if attempt == self.max_retries - 1:
+                            return self._extract_json(content)
+                        continue
+
+                return content
+
+            except Exception as e:
+                logger.error(f"LLM call failed (attempt {attempt + 1}): {e}")
+
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                else:
+                    raise
+
+        raise Exception(f"LLM call failed after {self.max_retries} retries")
+
     def _extract_json(self, text):
         """Try to extract JSON from text response."""
         # Try to find JSON in markdown code blocks
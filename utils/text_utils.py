@@ -3,11 +3,28 @@ import re
 import chardet
 
 
+_READ_CHUNK_SIZE = 1024 * 1024
+
+# Line boundaries as counted by str.splitlines() ("\r" is already translated).
+_LINE_BREAK_PATTERN = re.compile('[\n\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def new_encoding_detector():
+    """Incremental detector: feed() byte chunks until .done, then close()['encoding']."""
+    return chardet.UniversalDetector()
+
+
 def detect_encoding(file_path):
     """Detect file encoding."""
+    # Same result as chardet.detect(whole_file): the detector ignores input once
+    # it is done, so feed it in chunks and stop early instead of loading the file.
+    detector = new_encoding_detector()
     with open(file_path, 'rb') as f:
-        raw_data = f.read()
-    result = chardet.detect(raw_data)
+        for chunk in iter(lambda: f.read(_READ_CHUNK_SIZE), b''):
+            detector.feed(chunk)
+            if detector.done:
+                break
+    result = detector.close()
     return result['encoding']
 
 
@@ -24,6 +41,58 @@ def read_text_file(file_path):
     return content
 
 
+class TextStats:
+    """
+    Incremental character/line counter fed with decoded text chunks.
+
+    Chunks must already use universal newlines (text-mode reads, or
+    io.IncrementalNewlineDecoder(..., translate=True)); a leading BOM is ignored
+    like read_text_file does.
+    """
+
+    def __init__(self):
+        self.char_count = 0
+        self._line_breaks = 0
+        self._first = True
+        self._last_char = ''
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        if self._first:
+            self._first = False
+            if chunk.startswith('\ufeff'):
+                chunk = chunk[1:]
+                if not chunk:
+                    return
+        self.char_count += len(chunk)
+        self._line_breaks += len(_LINE_BREAK_PATTERN.findall(chunk))
+        self._last_char = chunk[-1]
+
+    def result(self):
+        line_count = self._line_breaks
+        if self._last_char and not _LINE_BREAK_PATTERN.match(self._last_char):
+            line_count += 1
+        return {'char_count': self.char_count, 'line_count': line_count}
+
+
+def text_file_stats(file_path, encoding=None):
+    """
+    Count characters and lines of a text file without loading it whole.
+
+    Matches len(text) and len(text.splitlines()) for text = read_text_file(file_path).
+    Pass `encoding` when it is already known to skip the detection pass.
+    """
+    if encoding is None:
+        encoding = detect_encoding(file_path)
+    stats = TextStats()
+    # Universal newlines like read_text_file, so "\r\n" is one character here too.
+    with open(file_path, 'r', encoding=encoding) as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK_SIZE), ''):
+            stats.feed(chunk)
+    return stats.result()
+
+
 def normalize_punctuation(text):
     """Normalize full-width and half-width punctuation."""
     replacements = {